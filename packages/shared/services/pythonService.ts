@@ -295,14 +295,16 @@ class PythonService {
       this.client.on('message', (data) => {
         try {
           const message = JSON.parse(data.toString())
-          const { type, payload, job_id } = message
+          const messages = message.type === PythonMessageType.BATCH ? message.payload : [message]
 
-          const callback = this.messageCallbacks[type as PythonMessageType]
+          for (const { type, payload, job_id } of messages) {
+            const callback = this.messageCallbacks[type as PythonMessageType]
 
-          if (callback) {
-            callback({ ...payload, job_id })
-          } else {
-            logger.warn(`⚠️ No callback registered for message type: ${type}`)
+            if (callback) {
+              callback({ ...payload, job_id })
+            } else {
+              logger.warn(`⚠️ No callback registered for message type: ${type}`)
+            }
           }
         } catch (error) {
           logger.error('❌ Error processing message: ' + error)
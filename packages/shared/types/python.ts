@@ -39,4 +39,7 @@ export enum PythonMessageType {
   FACE_MATCHING_PROGRESS = 'face_matching_progress',
   FACE_MATCHING_COMPLETED = 'face_matching_complete',
   FACE_MATCHING_ERROR = 'face_matching_error',
+
+  // Several messages sent as one frame
+  BATCH = 'batch',
 }
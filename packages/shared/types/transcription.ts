@@ -26,6 +26,7 @@ export interface Transcription {
 }
 export type TranscriptionProgress = {
   progress: number
-  elapsed: string
+  // Seconds since the transcription started
+  elapsed: number
   job_id: string
 }
@@ -1,82 +1,347 @@
 import sys
-import os
 import json
+import platform
+from typing import Dict, List, Optional, Tuple, Union
+
+import dlib
 import face_recognition
+import numpy as np
+from PIL import Image
+
+from face_store import append_known_faces
+
+# Detection cost scales with pixel count while the encoding is computed on a
+# 150px face chip, so larger images only slow the detector down.
+MAX_IMAGE_DIMENSION = 800
 
-def add_face(name: str, image_path: str, known_faces_file: str) -> None:
+# Each jitter is a full ResNet forward pass; keep enrollment at one unless asked
+DEFAULT_NUM_JITTERS = 1
+
+# (top, right, bottom, left), the face_recognition location order
+FaceLocation = Tuple[int, int, int, int]
+
+def check_dlib_build() -> None:
     """
-    Extracts a face encoding from an image and adds it to the known faces file.
+    Warn when dlib was compiled without the SIMD instructions its ResNet
+    encoder relies on; scalar builds are several times slower.
     """
-    if not os.path.exists(image_path):
-        print(json.dumps({"status": "error", "message": "Image file not found."}), file=sys.stderr)
-        sys.exit(1)
+    machine = platform.machine().lower()
+    if machine in ("x86_64", "amd64", "i386", "i686"):
+        if not getattr(dlib, "USE_AVX_INSTRUCTIONS", True):
+            print(json.dumps({
+                "status": "warning",
+                "message": "dlib built without AVX; rebuild with "
+                           "python setup.py install --set USE_AVX_INSTRUCTIONS=1"
+            }), file=sys.stderr)
+    elif machine.startswith(("arm", "aarch64")):
+        if not getattr(dlib, "USE_NEON_INSTRUCTIONS", True):
+            print(json.dumps({
+                "status": "warning",
+                "message": "dlib built without NEON; rebuild with "
+                           "python setup.py install --set USE_NEON_INSTRUCTIONS=1 --compiler-flags \"-O3 -mfpu=neon\""
+            }), file=sys.stderr)
+
 
+def _load_image(image_path: str) -> Tuple[np.ndarray, float]:
+    """
+    Load an image as RGB, downscaled so its longest side is at most MAX_IMAGE_DIMENSION.
+
+    Returns:
+        Tuple of (image, scale factor applied to the original size)
+    """
+    image = face_recognition.load_image_file(image_path)
+
+    height, width = image.shape[:2]
+    scale = min(1.0, MAX_IMAGE_DIMENSION / max(height, width))
+    if scale < 1.0:
+        resized = Image.fromarray(image).resize(
+            (int(width * scale), int(height * scale)), Image.BILINEAR
+        )
+        image = np.asarray(resized)
+
+    return image, scale
+
+
+def parse_bbox(value: str) -> FaceLocation:
+    """Parse a "top,right,bottom,left" string into a face location."""
+    parts = value.split(",")
+    if len(parts) != 4:
+        raise ValueError(f"Expected top,right,bottom,left but got {value!r}")
+    top, right, bottom, left = (int(part) for part in parts)
+    return top, right, bottom, left
+
+
+def _scale_bbox(bbox: FaceLocation, scale: float) -> FaceLocation:
+    """Map a bounding box on the original image onto the downscaled one."""
+    top, right, bottom, left = bbox
+    return int(top * scale), int(right * scale), int(bottom * scale), int(left * scale)
+
+
+def cuda_available() -> bool:
+    """Check whether dlib was built with CUDA and can see a GPU."""
     try:
-        image = face_recognition.load_image_file(image_path)
-        face_encodings = face_recognition.face_encodings(image)
+        return bool(getattr(dlib, "DLIB_USE_CUDA", False)) and dlib.cuda.get_num_devices() > 0
+    except Exception:
+        return False
 
-        if len(face_encodings) == 0:
-            print(json.dumps({"status": "warning", "message": "No face detected in image."}), file=sys.stderr)
-            sys.exit(0)  # Not an error, just no face found
 
-        if len(face_encodings) > 1:
-            print(json.dumps({"status": "warning", "message": "Multiple faces found. Using the first one."}), file=sys.stderr)
+def _detect_faces(images: List[np.ndarray], use_gpu: bool = False) -> List[List[Tuple[int, int, int, int]]]:
+    """
+    Locate faces in each image.
+
+    HOG runs on the CPU; with use_gpu the CNN (MMOD) detector runs on CUDA,
+    batched across images when they share the same shape.
+    """
+    if not use_gpu:
+        return [face_recognition.face_locations(image) for image in images]
+
+    if len(images) > 1 and len({image.shape for image in images}) == 1:
+        return face_recognition.batch_face_locations(images)
+
+    return [face_recognition.face_locations(image, model="cnn") for image in images]
+
+
+def _encode_images(
+    image_paths: List[str],
+    use_gpu: bool = False,
+    bboxes: Optional[List[Optional[FaceLocation]]] = None,
+    num_jitters: int = DEFAULT_NUM_JITTERS,
+    landmark_model: str = "large"
+) -> Tuple[List[np.ndarray], List[Dict[str, str]]]:
+    """
+    Extract the first face encoding from each image.
+
+    Images with a caller-supplied bounding box skip face detection and are
+    encoded directly from that box.
+
+    Returns:
+        Tuple of (encodings, per-image status dictionaries for skipped images)
+    """
+    encodings: List[np.ndarray] = []
+    skipped: List[Dict[str, str]] = []
+
+    loaded: List[Tuple[str, np.ndarray, Optional[List[FaceLocation]]]] = []
+    for image_path, bbox in zip(image_paths, bboxes or [None] * len(image_paths)):
+        try:
+            image, scale = _load_image(image_path)
+        except FileNotFoundError:
+            skipped.append({"image_path": image_path, "status": "error", "message": "Image file not found."})
+            continue
+        loaded.append((image_path, image, [_scale_bbox(bbox, scale)] if bbox else None))
+
+    to_detect = [image for _, image, locations in loaded if locations is None]
+    detected = iter(_detect_faces(to_detect, use_gpu) if to_detect else [])
+
+    for image_path, image, face_locations in loaded:
+        if face_locations is None:
+            face_locations = next(detected)
+
+        if len(face_locations) == 0:
+            # Not an error, just no face found
+            skipped.append({"image_path": image_path, "status": "warning", "message": "No face detected in image."})
+            continue
+
+        if len(face_locations) > 1:
+            print(json.dumps({
+                "status": "warning",
+                "message": f"Multiple faces found in {image_path}. Using the first one."
+            }), file=sys.stderr)
+
+        face_encodings = face_recognition.face_encodings(
+            image,
+            known_face_locations=face_locations[:1],
+            num_jitters=num_jitters,
+            model=landmark_model
+        )
+        encodings.append(face_encodings[0])
+
+    return encodings, skipped
+
+
+def add_faces_batch(
+    name: str,
+    image_paths: List[str],
+    known_faces_file: str,
+    use_gpu: bool = False,
+    bboxes: Optional[List[Optional[FaceLocation]]] = None,
+    num_jitters: int = DEFAULT_NUM_JITTERS,
+    landmark_model: str = "large"
+) -> Dict[str, Union[str, int, List[Dict[str, str]]]]:
+    """
+    Extracts face encodings from several images of one person and adds them
+    to the known faces file with a single append.
+
+    bboxes optionally gives a (top, right, bottom, left) box per image, in
+    original image coordinates, to skip detection for that image.
+    num_jitters and landmark_model ("large" 68-point or faster "small"
+    5-point) are passed through to face_recognition.face_encodings.
 
-        new_encoding = face_encodings[0].tolist()
+    Returns:
+        Status dictionary with "status", "message", "added" and "skipped" images
+    """
+    try:
+        encodings, skipped = _encode_images(image_paths, use_gpu, bboxes, num_jitters, landmark_model)
 
-        # Load existing known faces
-        known_faces = []
-        if os.path.exists(known_faces_file):
+        if encodings:
+            # Append the names to the JSONL names file and the encodings to the float32 sidecar
+            # Format: {"name": "Person Name", "row": N} per line, row N of <file>.f32
             try:
-                with open(known_faces_file, 'r') as f:
-                    content = f.read().strip()
-                    if content:  # Only parse if file is not empty
-                        known_faces = json.load(open(known_faces_file, 'r'))
-                    else:
-                        known_faces = []
-            except json.JSONDecodeError as e:
-                print(json.dumps({
-                    "status": "error", 
-                    "message": f"Corrupted known_faces.json: {e.msg} at line {e.lineno}"
-                }), file=sys.stderr)
-                sys.exit(1)
-        
-        # Add new face encoding in the format expected by FaceRecognizer
-        # Format: [{"name": "Person Name", "encoding": [...]}, ...]
-        known_faces.append({
-            "name": name,
-            "encoding": new_encoding
-        })
-
-        # Write back to file with proper formatting
-        with open(known_faces_file, 'w') as f:
-            json.dump(known_faces, f, indent=2)
-        
-        print(json.dumps({
-            "status": "success", 
-            "message": f"Face for {name} added successfully.",
-            "total_encodings": len(known_faces)
-        }))
-        sys.exit(0)
+                append_known_faces(known_faces_file, [name] * len(encodings), np.stack(encodings))
+            except ValueError as e:
+                return {"status": "error", "message": f"Corrupted known faces file: {e}"}
+
+        return {
+            "status": "warning" if skipped else "success",
+            "message": f"Added {len(encodings)} of {len(image_paths)} face(s) for {name}.",
+            "added": len(encodings),
+            "skipped": skipped
+        }
 
     except Exception as e:
-        print(json.dumps({
-            "status": "error", 
-            "message": f"Error processing image: {str(e)}"
-        }), file=sys.stderr)
         import traceback
         traceback.print_exc(file=sys.stderr)
+        return {"status": "error", "message": f"Error processing image: {str(e)}"}
+
+
+def add_face(
+    name: str,
+    image_path: str,
+    known_faces_file: str,
+    use_gpu: bool = False,
+    bbox: Optional[FaceLocation] = None,
+    num_jitters: int = DEFAULT_NUM_JITTERS,
+    landmark_model: str = "large"
+) -> Dict[str, str]:
+    """
+    Extracts a face encoding from an image and adds it to the known faces file.
+
+    Without a bbox the face is detected; with one, detection is skipped.
+
+    Returns:
+        Status dictionary with "status" ("success", "warning" or "error") and "message"
+    """
+    result = add_faces_batch(
+        name, [image_path], known_faces_file, use_gpu, [bbox], num_jitters, landmark_model
+    )
+
+    if result["status"] == "error":
+        return {"status": "error", "message": str(result["message"])}
+    if result["skipped"]:
+        skipped = result["skipped"][0]
+        return {"status": skipped["status"], "message": skipped["message"]}
+
+    return {"status": "success", "message": f"Face for {name} added successfully."}
+
+
+def run_server(
+    use_gpu: bool = False,
+    num_jitters: int = DEFAULT_NUM_JITTERS,
+    landmark_model: str = "large"
+) -> None:
+    """
+    Serve add_face requests from stdin so dlib and its models load only once.
+
+    Each stdin line is a JSON object with "name", "known_faces_file" and either
+    "image_path" (optionally with a "bbox" [top, right, bottom, left]) or
+    "image_paths"; each request gets exactly one JSON status line on stdout.
+    """
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            request = json.loads(line)
+            if "image_paths" in request:
+                result = add_faces_batch(
+                    request["name"], request["image_paths"], request["known_faces_file"], use_gpu,
+                    num_jitters=num_jitters, landmark_model=landmark_model
+                )
+            else:
+                bbox = request.get("bbox")
+                result = add_face(
+                    request["name"], request["image_path"], request["known_faces_file"], use_gpu,
+                    tuple(int(v) for v in bbox) if bbox else None,
+                    num_jitters, landmark_model
+                )
+        except (json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+            result = {"status": "error", "message": f"Invalid request: {e}"}
+
+        sys.stdout.write(json.dumps(result) + "\n")
+        sys.stdout.flush()
+
+
+def main() -> None:
+    """CLI entry point."""
+    import argparse
+
+    usage_error = {
+        "status": "error",
+        "message": "Usage: python add_face.py [--gpu | --gpu-if-available] [--jitters N] [--fast] [--bbox top,right,bottom,left] <name> <image_path> <known_faces_file> | "
+                   "[--gpu] --batch <name> <image1,image2,...> <known_faces_file> | [--gpu] --server"
+    }
+
+    parser = argparse.ArgumentParser(description="Add known face encodings from images", add_help=False)
+    parser.add_argument("args", nargs="*")
+    parser.add_argument("--server", action="store_true", help="Serve JSON requests from stdin")
+    parser.add_argument("--batch", action="store_true", help="Encode a comma-separated list of images")
+    parser.add_argument("--gpu", action="store_true", help="Detect faces with the CNN model on CUDA if available")
+    parser.add_argument("--gpu-if-available", action="store_true",
+                        help="Like --gpu, but fall back to the CPU without a warning")
+    parser.add_argument("--bbox", help="Known face box as top,right,bottom,left; skips detection")
+    parser.add_argument("--jitters", type=int, default=DEFAULT_NUM_JITTERS,
+                        help="Re-sample each face this many times when encoding (slower, slightly more accurate)")
+    parser.add_argument("--fast", action="store_true", help="Use the 5-point landmark model for encoding")
+    args, unknown = parser.parse_known_args()
+
+    if unknown or args.jitters < 1:
+        print(json.dumps(usage_error), file=sys.stderr)
         sys.exit(1)
 
-if __name__ == "__main__":
-    if len(sys.argv) != 4:
+    landmark_model = "small" if args.fast else "large"
+
+    bbox = None
+    if args.bbox:
+        try:
+            bbox = parse_bbox(args.bbox)
+        except ValueError as e:
+            print(json.dumps({"status": "error", "message": f"Invalid --bbox: {e}"}), file=sys.stderr)
+            sys.exit(1)
+
+    check_dlib_build()
+
+    use_gpu = (args.gpu or args.gpu_if_available) and cuda_available()
+    if args.gpu and not use_gpu:
         print(json.dumps({
-            "status": "error",
-            "message": "Usage: python add_face.py <name> <image_path> <known_faces_file>"
+            "status": "warning",
+            "message": "--gpu requested but dlib has no CUDA device. Falling back to CPU."
         }), file=sys.stderr)
+
+    if args.server and not args.args:
+        run_server(use_gpu, args.jitters, landmark_model)
+        sys.exit(0)
+
+    if args.batch and len(args.args) == 3:
+        name, image_list, known_faces_file = args.args
+        image_paths = [path for path in image_list.split(",") if path]
+        result = add_faces_batch(
+            name, image_paths, known_faces_file, use_gpu,
+            num_jitters=args.jitters, landmark_model=landmark_model
+        )
+    elif not args.server and not args.batch and len(args.args) == 3:
+        name, image_path, known_faces_file = args.args
+        result = add_face(name, image_path, known_faces_file, use_gpu, bbox, args.jitters, landmark_model)
+    else:
+        print(json.dumps(usage_error), file=sys.stderr)
         sys.exit(1)
-    
-    name = sys.argv[1]
-    image_path = sys.argv[2]
-    known_faces_file = sys.argv[3]
-    add_face(name, image_path, known_faces_file)
\ No newline at end of file
+
+    if result["status"] == "success":
+        print(json.dumps(result))
+        sys.exit(0)
+
+    print(json.dumps(result), file=sys.stderr)
+    sys.exit(1 if result["status"] == "error" else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,30 @@
 import sys
 import json
+import signal
+import socket
 import argparse
 import asyncio
+import contextlib
+import functools
+import itertools
 import logging
+import threading
 from pathlib import Path
-from typing import Optional, Callable, Dict, Union, Set, List, Awaitable
+from typing import Optional, Callable, Dict, Union, Set, List, Awaitable, Tuple, Iterator
 from dataclasses import dataclass, field
 from enum import Enum
-from datetime import datetime
-from concurrent.futures import Future
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+from multiprocessing.managers import SyncManager
+import queue
 import websockets
 from websockets.legacy.server import WebSocketServerProtocol  
 from websockets.exceptions import ConnectionClosed, ConnectionClosedOK, ConnectionClosedError
 
 from transcribe import TranscriptionService
-from analyze import AnalysisConfig, OutputManager, VideoAnalysisResult, VideoAnalyzer
+from analyze import AnalysisConfig, OutputManager, run_analysis
 from batch_add_faces import batch_add_faces_from_folder
 from face_matcher import FaceMatchingResult
 import os
@@ -31,31 +41,224 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 logging.getLogger('websockets').setLevel(logging.WARNING)
 
+try:
+    import uvloop
+    HAS_UVLOOP = sys.platform != 'win32'
+except ImportError:
+    HAS_UVLOOP = False
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+    logger.info("orjson not installed. Using stdlib json for WebSocket frames.")
+
+try:
+    import msgpack
+    HAS_MSGPACK = True
+except ImportError:
+    HAS_MSGPACK = False
+
+# WebSocket subprotocol a client offers to receive progress frames as MessagePack
+MSGPACK_SUBPROTOCOL = "msgpack"
+
+# Server buffer sizes: 1 MiB of pending writes before send() waits, 16 MiB frames
+SERVER_WRITE_LIMIT = 2 ** 20
+SERVER_MAX_MESSAGE_SIZE = 2 ** 24
+SERVER_PING_INTERVAL = 30
+SERVER_PING_TIMEOUT = 60
+SERVER_BACKLOG = 100
+HAS_TCP_CORK = hasattr(socket, "TCP_CORK")
+
 # Type aliases
 JsonPrimitive = Union[str, int, float, bool, None]
 JsonValue = Union[JsonPrimitive, Dict[str, 'JsonValue'], List['JsonValue']]
 JsonDict = Dict[str, JsonValue]
 ProgressCallback = Callable[[float, float, float, float], None]
-TranscriptionProgressCallback = Callable[[int, str], None]
+# (progress percent, elapsed seconds)
+TranscriptionProgressCallback = Callable[[int, int], None]
 ReindexProgressCallback = Callable[[Dict[str, Union[str, int]]], Awaitable[None]]
+# (st_dev, st_ino): identifies a file however it is named
+FileKey = Tuple[int, int]
+
+
+def create_tcp_listener(host: str, port: int, reuse_port: bool = False) -> socket.socket:
+    """
+    Bind a listening TCP socket for the WebSocket server.
+    
+    Nagle is disabled on the listener so accepted connections inherit
+    TCP_NODELAY. With reuse_port several worker processes can bind the same
+    port and the kernel spreads incoming connections across them.
+    """
+    family, sock_type, proto, _, address = socket.getaddrinfo(
+        host, port, type=socket.SOCK_STREAM, flags=socket.AI_PASSIVE
+    )[0]
+    sock = socket.socket(family, sock_type, proto)
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if reuse_port:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.bind(address)
+        sock.listen(SERVER_BACKLOG)
+        sock.setblocking(False)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+@contextlib.contextmanager
+def tcp_cork(websocket: "WebSocketServerProtocol") -> Iterator[None]:
+    """
+    Hold back partial TCP segments while several frames are written back to back.
+    
+    Uncorking sends them together in as few segments as possible. Unix
+    sockets and platforms without TCP_CORK are left alone; their frames go
+    out as written.
+    """
+    sock = websocket.transport.get_extra_info("socket") if HAS_TCP_CORK else None
+    if sock is not None and sock.family in (socket.AF_INET, socket.AF_INET6):
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_CORK, 1)
+        except OSError:
+            sock = None
+    else:
+        sock = None
+    
+    try:
+        yield
+    finally:
+        if sock is not None:
+            try:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_CORK, 0)
+            except OSError:
+                # Connection already gone
+                pass
+
+
+@functools.lru_cache(maxsize=1024)
+def resolve_path(path: str, strict: bool = False) -> str:
+    """
+    Resolve a path to its absolute, symlink-free form.
+    
+    Memoized so repeated requests for the same video skip the realpath
+    syscalls. With strict, a missing file raises FileNotFoundError, which
+    is never cached.
+    """
+    # Interned so ServiceState membership checks compare by identity first
+    return sys.intern(str(Path(path).resolve(strict=strict)))
+
+
+def file_key(path: str) -> FileKey:
+    """
+    Identify a file by device and inode, so hard links and other aliases of
+    one video map to the same key.
+    
+    Raises:
+        OSError: If the file cannot be stat'ed
+    """
+    st = os.stat(path)
+    return st.st_dev, st.st_ino
+
+
+def locate_video(path: str) -> Tuple[str, FileKey]:
+    """
+    Resolve an existing video's path and file key.
+    
+    Touches the filesystem, so the event loop runs it in an executor.
+    
+    Raises:
+        OSError: If the file does not exist or cannot be stat'ed
+    """
+    resolved = resolve_path(path, strict=True)
+    return resolved, file_key(resolved)
+
+
+
+_transcription_service: Optional[TranscriptionService] = None
+
+
+def get_transcription_service() -> TranscriptionService:
+    """
+    Return the process-wide transcription service.
+    
+    The Whisper model loads lazily on first use and is shared by every
+    handler, so it is loaded at most once per process.
+    """
+    global _transcription_service
+    if _transcription_service is None:
+        _transcription_service = TranscriptionService()
+    return _transcription_service
+
+# Parse an incoming WebSocket frame, text or binary; raises ValueError if it is
+# not valid JSON. Bound straight to the C parser so decoding a message adds no
+# Python-level call on top of the parse itself.
+decode_frame: Callable[[Union[str, bytes]], JsonValue] = orjson.loads if HAS_ORJSON else json.loads
+
+
+def _json_default(obj: object) -> JsonValue:
+    """Serialize NumPy arrays and scalars for the stdlib json fallback, as orjson does."""
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def encode_frame(frame: JsonDict) -> bytes:
+    """
+    Serialize an outgoing WebSocket frame as UTF-8 JSON bytes.
+
+    Frames always go out as binary frames, which websockets writes as-is
+    instead of handling them as text; the client decodes both the same way.
+    """
+    if HAS_ORJSON:
+        return orjson.dumps(frame, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(frame, separators=(",", ":"), default=_json_default).encode()
+
+
+@functools.lru_cache(maxsize=64)
+def progress_envelope(msg_type: str, job_id: Optional[str]) -> Tuple[bytes, bytes]:
+    """
+    Pre-encode the fixed part of a JSON progress frame for one job.
+    
+    Returns:
+        Tuple of (bytes before the payload, bytes after it)
+    """
+    head = encode_frame({"type": msg_type, "job_id": job_id} if job_id is not None else {"type": msg_type})
+    return head[:-1] + b',"payload":', b"}"
+
 
+# Reply to application-level pings without going through the encoder
+PONG_FRAME = b'{"type":"pong"}'
 
-class ServiceStatus(Enum):
-    """Service operational states."""
+
+class ServiceStatus(str, Enum):
+    """Service operational states. Members are str, so they serialize as their value."""
     LOADING = "loading"
     READY = "ready"
     PROCESSING = "processing"
     ERROR = "error"
 
 
-class MessageType(Enum):
-    """WebSocket message types for client-server communication."""
+class MessageType(str, Enum):
+    """
+    WebSocket message types for client-server communication.
+    
+    Members are str, so frames can embed them directly instead of paying
+    for an Enum .value lookup on every send. They also print as their value,
+    so log calls pass them as-is and only format them if the record is emitted.
+    """
+    
+    __str__ = str.__str__
+    __format__ = str.__format__
     
     # Client requests
     ANALYZE = "analyze"
     TRANSCRIBE = "transcribe"
     REINDEX_FACES = "reindex_faces"
     HEALTH = "health"
+    CONFIGURE = "configure"
     
     # Server responses
     STATUS = "status"
@@ -73,6 +276,92 @@ class MessageType(Enum):
     FACE_MATCHING_PROGRESS = "face_matching_progress"
     FACE_MATCHING_COMPLETE = "face_matching_complete"
     FACE_MATCHING_ERROR = "face_matching_error"
+    BATCH = "batch"
+
+
+# High-frequency frames that may be sent as MessagePack; everything else stays JSON
+PROGRESS_MESSAGE_TYPES = frozenset({
+    MessageType.ANALYSIS_PROGRESS,
+    MessageType.TRANSCRIPTION_PROGRESS,
+    MessageType.REINDEX_PROGRESS,
+    MessageType.FACE_MATCHING_PROGRESS,
+})
+
+
+# Error replies whose text never changes, encoded once at import
+STATIC_ERROR_FRAMES: Dict[Tuple[MessageType, str], bytes] = {
+    (msg_type, message): encode_frame({"type": msg_type, "payload": {"message": message}})
+    for msg_type, message in (
+        (MessageType.ERROR, "Message must be an object"),
+        (MessageType.ERROR, "Message type must be a string"),
+        (MessageType.ERROR, "Payload must be an object"),
+        (MessageType.ANALYSIS_ERROR, "Missing or invalid 'video_path' in payload"),
+        (MessageType.ANALYSIS_ERROR, "Missing or invalid 'job_id' in payload"),
+        (MessageType.TRANSCRIPTION_ERROR, "Missing or invalid 'video_path' or 'json_file_path' in payload"),
+        (MessageType.FACE_MATCHING_ERROR, "Missing or invalid 'person_name'"),
+        (MessageType.FACE_MATCHING_ERROR, "Missing or invalid 'reference_images'"),
+        (MessageType.REINDEX_ERROR, "Face reindexing is already in progress. Please wait."),
+    )
+}
+
+
+def encode_progress_frame(frame: JsonDict) -> bytes:
+    """Serialize a progress frame as MessagePack, which is smaller than JSON for numeric dicts."""
+    return msgpack.packb(frame, use_bin_type=True)
+
+
+@dataclass
+class AnalysisOutcome:
+    """What an analysis worker process hands back to the event loop."""
+    error: Optional[str] = None
+    output_path: Optional[str] = None
+    # Result JSON, returned only when it could not be saved to output_path
+    result_json: Optional[bytes] = None
+
+
+def run_analysis_job(
+    video_path: str,
+    config: AnalysisConfig,
+    job_id: str,
+    progress_queue: "queue.Queue[Tuple[float, float, float, float]]",
+) -> AnalysisOutcome:
+    """
+    Worker process entry point for one analysis job.
+    
+    The result is streamed to disk here. The saved file is then the
+    ANALYSIS_COMPLETED payload, so the event loop never serializes the full
+    result and it does not cross the process boundary; it is only encoded
+    in memory if saving failed.
+    """
+    result = run_analysis(video_path, config, progress_queue)
+    if result.error:
+        return AnalysisOutcome(error=result.error)
+    
+    output_path = OutputManager.get_output_path(video_path, config.output_dir)
+    if OutputManager.save_result(result, output_path):
+        return AnalysisOutcome(output_path=str(output_path))
+    return AnalysisOutcome(output_path=str(output_path), result_json=OutputManager.encode_result(result))
+
+
+def get_latest_progress(progress_queue: "queue.Queue[Optional[Tuple[float, float, float, float]]]") -> Tuple[Optional[Tuple[float, float, float, float]], bool]:
+    """
+    Block for the next progress tick, then skip ahead to the newest one queued.
+    
+    Returns:
+        Tuple of (latest tick or None, whether the None sentinel was reached)
+    """
+    latest = progress_queue.get()
+    if latest is None:
+        return None, True
+    while True:
+        try:
+            progress = progress_queue.get_nowait()
+        except queue.Empty:
+            return latest, False
+        if progress is None:
+            return latest, True
+        latest = progress
+
 
 @dataclass
 class ServiceMetrics:
@@ -96,7 +385,12 @@ class ServiceMetrics:
             self.failed_transcriptions += 1
     
     def to_dict(self) -> Dict[str, Union[int, float]]:
-        """Convert metrics to dictionary format."""
+        """
+        Convert metrics to dictionary format.
+        
+        Only called when the health frame is rebuilt, which the ServiceState
+        version limits to once per recorded completion.
+        """
         total_analyses = max(self.total_analyses, 1)
         total_transcriptions = max(self.total_transcriptions, 1)
         
@@ -121,112 +415,118 @@ class ServiceState:
     """Centralized service state management with concurrent request tracking."""
     
     status: ServiceStatus = ServiceStatus.READY
-    active_analyses: Set[str] = field(default_factory=set)
+    # Video being analyzed per file key; the path is kept for logging
+    active_analyses: Dict[FileKey, str] = field(default_factory=dict)
     active_transcriptions: Set[str] = field(default_factory=set)
     metrics: ServiceMetrics = field(default_factory=ServiceMetrics)
+    # Bumped on every start/finish so cached status snapshots know they are stale
+    version: int = 0
     
     def is_ready(self) -> bool:
         """Check if service is ready to accept requests."""
         return self.status == ServiceStatus.READY
     
-    def is_processing_video(self, video_path: str) -> bool:
+    def is_processing_video(self, video_key: FileKey) -> bool:
         """Check if a specific video is currently being processed."""
-        return video_path in self.active_analyses
+        return video_key in self.active_analyses
     
-    def start_analysis(self, video_path: str) -> None:
+    def start_analysis(self, video_key: FileKey, video_path: str) -> None:
         """Mark a video as being analyzed."""
-        self.active_analyses.add(video_path)
-        logger.info(f"Started analysis for {video_path} (active: {len(self.active_analyses)})")
+        self.active_analyses[video_key] = video_path
+        self.version += 1
+        logger.info("Started analysis for %s (active: %d)", video_path, len(self.active_analyses))
     
-    def finish_analysis(self, video_path: str, success: bool = True) -> None:
+    def finish_analysis(self, video_key: FileKey, success: bool = True) -> None:
         """Mark a video analysis as complete."""
-        self.active_analyses.discard(video_path)
+        video_path = self.active_analyses.pop(video_key, None)
         self.metrics.record_analysis(success)
-        logger.info(f"Finished analysis for {video_path} (active: {len(self.active_analyses)})")
+        self.version += 1
+        logger.info("Finished analysis for %s (active: %d)", video_path, len(self.active_analyses))
     
     def start_transcription(self, video_path: str) -> None:
         """Mark a video as being transcribed."""
-        self.active_transcriptions.add(video_path)
-        logger.info(f"Started transcription for {video_path} (active: {len(self.active_transcriptions)})")
+        self.active_transcriptions.add(sys.intern(video_path))
+        self.version += 1
+        logger.info("Started transcription for %s (active: %d)", video_path, len(self.active_transcriptions))
     
     def finish_transcription(self, video_path: str, success: bool = True) -> None:
         """Mark a video transcription as complete."""
         self.active_transcriptions.discard(video_path)
         self.metrics.record_transcription(success)
-        logger.info(f"Finished transcription for {video_path} (active: {len(self.active_transcriptions)})")
+        self.version += 1
+        logger.info("Finished transcription for %s (active: %d)", video_path, len(self.active_transcriptions))
 
 
 class ConnectionManager:
-    """Manages WebSocket connections and safe message sending."""
+    """Tracks active WebSocket connections and broadcasts to them."""
     
     def __init__(self) -> None:
+        # Only mutated from the event loop thread, so no lock is needed
         self.active_connections: Set["WebSocketServerProtocol"] = set()
-        self._lock: asyncio.Lock = asyncio.Lock()
     
-    async def register(self, websocket: WebSocketServerProtocol) -> None:
+    def register(self, websocket: WebSocketServerProtocol) -> None:
         """Register a new WebSocket connection."""
-        async with self._lock:
-            self.active_connections.add(websocket)
-            logger.info(f"Client registered: {websocket.remote_address} (total: {len(self.active_connections)})")
+        self.active_connections.add(websocket)
+        logger.info("Client registered: %s (total: %d)", websocket.remote_address, len(self.active_connections))
     
-    async def unregister(self, websocket: WebSocketServerProtocol) -> None:
+    def unregister(self, websocket: WebSocketServerProtocol) -> None:
         """Unregister a WebSocket connection."""
-        async with self._lock:
-            self.active_connections.discard(websocket)
-            logger.info(f"Client unregistered: {websocket.remote_address} (total: {len(self.active_connections)})")
+        self.active_connections.discard(websocket)
+        logger.info("Client unregistered: %s (total: %d)", websocket.remote_address, len(self.active_connections))
     
     def is_connected(self, websocket: WebSocketServerProtocol) -> bool:
         """Check if a WebSocket connection is still active."""
-        try:
-            return websocket in self.active_connections and websocket.open
-        except Exception:
-            return False
+        return websocket in self.active_connections and getattr(websocket, "open", False)
     
     def get_connection_count(self) -> int:
         """Get the current number of active connections."""
         return len(self.active_connections)
     
-    async def send_message(
-        self,
-        websocket: WebSocketServerProtocol,
-        msg_type: MessageType,
-        payload: JsonDict
-    ) -> bool:
+    def broadcast(self, msg_type: MessageType, payload: JsonDict) -> int:
+        """Send the same message to every connected client."""
+        return self.broadcast_frame({"type": msg_type, "payload": payload})
+    
+    def broadcast_frame(self, frame: JsonDict) -> int:
+        """Serialize a frame once and write it to every open connection."""
+        return self.broadcast_encoded(encode_frame(frame))
+    
+    def broadcast_encoded(self, message: bytes) -> int:
         """
-        Send a message to a WebSocket client with comprehensive error handling.
+        Write an already serialized frame to every open connection.
+        
+        Uses websockets.broadcast, which writes to each transport without
+        waiting for it to drain, so one slow client does not hold up the rest.
         
         Returns:
-            True if message was sent successfully, False otherwise.
+            Number of connections the frame was written to.
         """
-        if not self.is_connected(websocket):
-            logger.debug(f"Cannot send {msg_type.value}: connection not active")
-            return False
+        connections = [ws for ws in self.active_connections if ws.open]
+        if connections:
+            websockets.broadcast(connections, message)
+        return len(connections)
+    
+    def send_nowait(self, websocket: "WebSocketServerProtocol", message: bytes) -> bool:
+        """
+        Write an already serialized frame to one connection without awaiting drain.
         
-        try:
-            message = json.dumps({"type": msg_type.value, "payload": payload})
-            await websocket.send(message)
-            return True
-        except ConnectionClosedOK:
-            logger.debug(f"Connection closed normally while sending {msg_type.value}")
-            return False
-        except ConnectionClosedError as e:
-            logger.debug(f"Connection closed with error while sending {msg_type.value}: {e.code}")
-            return False
-        except ConnectionClosed as e:
-            logger.debug(f"Connection closed while sending {msg_type.value}: {e}")
-            return False
-        except BrokenPipeError:
-            logger.debug(f"Broken pipe while sending {msg_type.value}")
-            return False
-        except OSError as e:
-            if e.errno == 32:  # EPIPE - Broken pipe
-                logger.debug(f"Broken pipe (OSError) while sending {msg_type.value}")
-            else:
-                logger.warning(f"OSError while sending {msg_type.value}: {e}")
-            return False
-        except Exception as e:
-            logger.warning(f"Unexpected error sending {msg_type.value}: {e}")
+        Returns:
+            True if the frame was written, False if the connection is not active
+            or is in the middle of a fragmented message.
+        """
+        if not self.is_connected(websocket) or self.is_fragmenting(websocket):
             return False
+        websockets.broadcast([websocket], message)
+        return True
+    
+    @staticmethod
+    def is_fragmenting(websocket: "WebSocketServerProtocol") -> bool:
+        """
+        Check whether a fragmented message is being sent on the connection.
+        
+        websockets.broadcast skips such connections, so a frame written with
+        send_nowait would be dropped; send() waits for the message to finish.
+        """
+        return websocket._fragmented_message_waiter is not None
 
 
 class CallbackGuard:
@@ -246,6 +546,142 @@ class CallbackGuard:
         return not self.cancelled and self.connection_manager.is_connected(self.websocket)
 
 
+class ConcurrencyLimiter:
+    """
+    Counting limiter whose limit can change while it is in use.
+    
+    Unlike asyncio.Semaphore, the limit is plain state guarded by a
+    Condition, so raising it wakes waiters and lowering it lets running
+    holders finish while new ones wait.
+    """
+    
+    def __init__(self, limit: int) -> None:
+        self._limit: int = limit
+        self._active: int = 0
+        self._condition: asyncio.Condition = asyncio.Condition()
+    
+    @property
+    def limit(self) -> int:
+        return self._limit
+    
+    async def set_limit(self, limit: int) -> None:
+        """Change the limit and let waiters re-check it."""
+        async with self._condition:
+            self._limit = limit
+            self._condition.notify_all()
+    
+    async def __aenter__(self) -> None:
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._active < self._limit)
+            self._active += 1
+    
+    async def __aexit__(self, *exc_info: object) -> None:
+        async with self._condition:
+            self._active -= 1
+            self._condition.notify(1)
+
+
+class ProgressSender:
+    """
+    Sends progress updates from worker threads through a single writer task.
+
+    Publishing only schedules a queue put with call_soon_threadsafe, so no
+    Task or Future is created per update. With coalesce (the default) updates
+    published while a send is in flight replace each other, so a burst of
+    ticks costs one frame with the latest values instead of one per tick,
+    and the loop is woken at most once per burst rather than once per tick;
+    without it every update is sent in order. Given send_batch, updates that
+    queue up behind an uncoalesced send go out together in one frame.
+
+    Pending memory is bounded: a coalescing sender holds at most one queued
+    and one not-yet-handed-over update however slow the client is. An
+    uncoalesced sender never drops, since each of its updates carries data
+    the client needs, so its backlog is bounded by the job's own output.
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        send: Callable[[JsonDict], Awaitable[bool]],
+        coalesce: bool = True,
+        send_batch: Optional[Callable[[List[JsonDict]], Awaitable[bool]]] = None,
+    ) -> None:
+        self._loop: asyncio.AbstractEventLoop = loop
+        self._send: Callable[[JsonDict], Awaitable[bool]] = send
+        self._send_batch: Optional[Callable[[List[JsonDict]], Awaitable[bool]]] = send_batch
+        self._queue: "asyncio.Queue[JsonDict]" = asyncio.Queue(maxsize=1 if coalesce else 0)
+        # Without coalescing the loop callback is the queue put itself, with no wrapper frame
+        self._enqueue: Callable[[JsonDict], None] = (
+            self._replace_latest if coalesce else self._queue.put_nowait
+        )
+        self._coalesce: bool = coalesce
+        # Latest update not yet handed to the loop, shared with publishing threads
+        self._latest_lock: threading.Lock = threading.Lock()
+        self._latest: Optional[JsonDict] = None
+        self._closed: bool = False
+        self._task: "asyncio.Task[None]" = loop.create_task(self._run())
+
+    def publish(self, progress_data: JsonDict) -> None:
+        """Queue a progress update; safe to call from any thread."""
+        if self._closed:
+            return
+        if not self._coalesce:
+            self._call_soon(self._enqueue, progress_data)
+            return
+        with self._latest_lock:
+            already_scheduled = self._latest is not None
+            self._latest = progress_data
+        # Otherwise the pending loop callback picks up this newer update
+        if not already_scheduled:
+            self._call_soon(self._take_latest)
+
+    def _call_soon(self, callback: Callable[..., None], *args: JsonDict) -> None:
+        try:
+            self._loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:
+            # Loop already closed
+            pass
+
+    def _take_latest(self) -> None:
+        with self._latest_lock:
+            progress_data, self._latest = self._latest, None
+        if progress_data is not None:
+            self._replace_latest(progress_data)
+
+    def _replace_latest(self, progress_data: JsonDict) -> None:
+        if self._closed:
+            return
+        if self._queue.full():
+            self._queue.get_nowait()
+            self._queue.task_done()
+        self._queue.put_nowait(progress_data)
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            if self._send_batch is not None:
+                while not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+            try:
+                if len(batch) > 1:
+                    await self._send_batch(batch)
+                else:
+                    await self._send(batch[0])
+            except Exception as e:
+                logger.warning(f"Failed to send progress update: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def close(self) -> None:
+        """Flush the latest pending update and stop the sender task."""
+        # Hand over an update whose loop callback has not run yet
+        self._take_latest()
+        self._closed = True
+        await self._queue.join()
+        self._task.cancel()
+
+
 class MessageHandler:
     """Handles WebSocket message routing and processing."""
     
@@ -258,16 +694,28 @@ class MessageHandler:
         self.state: "ServiceState" = service_state
         self.connection_manager: "ConnectionManager" = connection_manager
         self.max_concurrent_analyses: int = max_concurrent_analyses
-        self.analysis_semaphore: asyncio.Semaphore = asyncio.Semaphore(
-            max_concurrent_analyses
-        )
-        self.transcription_service: "TranscriptionService" = TranscriptionService()
+        # Starts at the pool size, which is also the most it can be raised to
+        self.analysis_limiter: ConcurrencyLimiter = ConcurrencyLimiter(max_concurrent_analyses)
+        self.transcription_service: "TranscriptionService" = get_transcription_service()
         self.reindex_lock: asyncio.Lock = asyncio.Lock()
 
-        # Track active callback guards for cleanup
-        self.active_guards: Set["CallbackGuard"] = set()
+        # Analyses are CPU-bound, so run them in separate processes rather than
+        # threads sharing the GIL. Spawn avoids forking a parent holding torch/CUDA state.
+        self._mp_context = multiprocessing.get_context("spawn")
+        self.analysis_pool: ProcessPoolExecutor = ProcessPoolExecutor(
+            max_workers=max_concurrent_analyses, mp_context=self._mp_context
+        )
+        self._mp_manager: Optional["SyncManager"] = None
+        self._mp_manager_lock: asyncio.Lock = asyncio.Lock()
+
+        # Active callback guards per connection (keyed by id(websocket)) for cleanup
+        self._guards_by_ws: Dict[int, List["CallbackGuard"]] = defaultdict(list)
 
-        # Message type to handler mapping
+        # Last encoded health frame and the state it was built from
+        self._health_frame: Optional[bytes] = None
+        self._health_key: Optional[Tuple[object, ...]] = None
+
+        # Message type to bound handler, built once so dispatch is a single dict lookup
         self._handlers: Dict[
             str, Callable[["WebSocketServerProtocol", JsonDict], Awaitable[None]]
         ] = {
@@ -276,23 +724,43 @@ class MessageHandler:
             MessageType.REINDEX_FACES.value: self._handle_reindex_faces,
             MessageType.HEALTH.value: self._handle_health,
             MessageType.FIND_MATCHING_FACES.value: self._handle_find_matching_faces,
+            MessageType.CONFIGURE.value: self._handle_configure,
         }
     
+    def _create_guard(self, websocket: "WebSocketServerProtocol") -> "CallbackGuard":
+        """Create a callback guard tracked under its connection."""
+        guard = CallbackGuard(websocket, self.connection_manager)
+        self._guards_by_ws[id(websocket)].append(guard)
+        return guard
+    
+    def _release_guard(self, guard: "CallbackGuard") -> None:
+        """Cancel a guard and stop tracking it."""
+        guard.cancel()
+        guards = self._guards_by_ws.get(id(guard.websocket))
+        if guards is None:
+            return
+        if guard in guards:
+            guards.remove(guard)
+        if not guards:
+            del self._guards_by_ws[id(guard.websocket)]
+    
     def cleanup_guards(self, websocket: "WebSocketServerProtocol") -> None:
         """Cancel all callback guards for a specific websocket."""
-        for guard in list(self.active_guards):
-            if guard.websocket == websocket:
-                guard.cancel()
-                self.active_guards.discard(guard)
+        for guard in self._guards_by_ws.pop(id(websocket), []):
+            guard.cancel()
     
-    async def process_message(
-        self, websocket: "WebSocketServerProtocol", message: str
+    async def dispatch_message(
+        self, websocket: "WebSocketServerProtocol", data: JsonValue
     ) -> None:
-        """Process and route incoming WebSocket messages."""
+        """Route an already parsed WebSocket message to its handler."""
         try:
-            data: JsonDict = json.loads(message)  # type: ignore[assignment]
+            if not isinstance(data, dict):
+                await self._send_error(websocket, "Message must be an object")
+                return
+            
             message_type = data.get("type")
-            payload = data.get("payload", {})
+            # Only build the empty default for messages that omit the payload
+            payload = data["payload"] if "payload" in data else {}
             
             if not isinstance(message_type, str):
                 await self._send_error(websocket, "Message type must be a string")
@@ -308,9 +776,6 @@ class MessageHandler:
             else:
                 await self._send_error(websocket, f"Unknown message type: {message_type}")
         
-        except json.JSONDecodeError as e:
-            logger.error(f"Invalid JSON received: {e}")
-            await self._send_error(websocket, "Invalid JSON format")
         except Exception as e:
             logger.exception("Error processing message")
             await self._send_error(websocket, f"Internal error: {str(e)}")
@@ -322,47 +787,207 @@ class MessageHandler:
         payload: JsonDict,
         job_id: Optional[str] = None,
     ) -> bool:
-        """Send a message through the connection manager."""
-        if not websocket:
-            logger.info("websocket connection has been closed before sending a message")
+        """
+        Build, encode and send a message frame to a client.
+        
+        Returns:
+            True if message was sent successfully, False otherwise.
+        """
+        if not self.connection_manager.is_connected(websocket):
+            logger.debug("Cannot send %s: connection not active", msg_type)
             return False
 
+        message = self._encode_message(websocket, msg_type, payload, job_id)
+        if message is None:
+            return False
+        return await self._send_encoded(websocket, msg_type, message)
+    
+    async def _send_progress(
+        self,
+        websocket: "WebSocketServerProtocol",
+        msg_type: MessageType,
+        payload: JsonDict,
+        job_id: Optional[str] = None,
+    ) -> bool:
+        """
+        Encode a progress frame and write it without waiting for the socket to drain.
+        
+        Progress frames are superseded by the next one, so they go through the
+        same non-blocking write path as broadcasts instead of awaiting send().
+        JSON frames splice the payload into the job's cached envelope, so only
+        the payload goes through the encoder.
+        """
+        if not (HAS_MSGPACK and websocket.subprotocol == MSGPACK_SUBPROTOCOL):
+            head, tail = progress_envelope(msg_type, job_id)
+            try:
+                message: Optional[bytes] = head + encode_frame(payload) + tail
+            except Exception as e:
+                logger.warning(f"Failed to encode message ({msg_type}): {e}")
+                return False
+        else:
+            message = self._encode_message(websocket, msg_type, payload, job_id)
+            if message is None:
+                return False
+        if self.connection_manager.is_fragmenting(websocket):
+            # Another job's result is going out in fragments; queue behind it
+            return await self._send_encoded(websocket, msg_type, message)
+        return self.connection_manager.send_nowait(websocket, message)
+    
+    async def _send_batch(
+        self,
+        websocket: "WebSocketServerProtocol",
+        msg_type: MessageType,
+        payloads: List[JsonDict],
+        job_id: Optional[str] = None,
+    ) -> bool:
+        """Send several messages of one type as a single BATCH frame."""
+        if not self.connection_manager.is_connected(websocket):
+            logger.debug("Cannot send %s: connection not active", msg_type)
+            return False
+        
+        frames: List[JsonValue] = []
+        for payload in payloads:
+            frame: JsonDict = {"type": msg_type, "payload": payload}
+            if job_id is not None:
+                frame["job_id"] = job_id
+            frames.append(frame)
+        
         try:
-            # Add job_id to payload if provided
+            message = encode_frame({"type": MessageType.BATCH, "payload": frames})
+        except Exception as e:
+            logger.warning(f"Failed to encode message ({msg_type}): {e}")
+            return False
+        return await self._send_encoded(websocket, msg_type, message)
+    
+    def _encode_message(
+        self,
+        websocket: "WebSocketServerProtocol",
+        msg_type: MessageType,
+        payload: JsonDict,
+        job_id: Optional[str] = None,
+    ) -> Optional[bytes]:
+        """Build and encode a message frame in the encoding the client negotiated."""
+        try:
+            frame: JsonDict = {"type": msg_type, "payload": payload}
+            # job_id sits next to the payload, where the client reads it, so the payload is never copied
             if job_id is not None:
-                payload = {**payload, "job_id": job_id}
+                frame["job_id"] = job_id
             
-            message = json.dumps({
-                "type": msg_type.value,
-                "payload": payload
-            })
+            if (
+                HAS_MSGPACK
+                and msg_type in PROGRESS_MESSAGE_TYPES
+                and websocket.subprotocol == MSGPACK_SUBPROTOCOL
+            ):
+                return encode_progress_frame(frame)
+            return encode_frame(frame)
+        except Exception as e:
+            logger.warning(f"Failed to encode message ({msg_type}): {e}")
+            return None
+    
+    async def _send_encoded(
+        self,
+        websocket: "WebSocketServerProtocol",
+        msg_type: MessageType,
+        message: Union[bytes, List[bytes]],
+    ) -> bool:
+        """
+        Send an already serialized frame; the single place frames reach the socket.
+        
+        A list of pieces goes out as the fragments of one message.
+        """
+        try:
             await websocket.send(message)
             return True
+        except ConnectionClosedOK:
+            logger.debug("Connection closed normally while sending %s", msg_type)
+        except ConnectionClosedError as e:
+            logger.debug("Connection closed with error while sending %s: %s", msg_type, e.code)
+        except ConnectionClosed as e:
+            logger.debug("Connection closed while sending %s: %s", msg_type, e)
+        except BrokenPipeError:
+            logger.debug("Broken pipe while sending %s", msg_type)
+        except OSError as e:
+            if e.errno == 32:  # EPIPE - Broken pipe
+                logger.debug("Broken pipe (OSError) while sending %s", msg_type)
+            else:
+                logger.warning(f"OSError while sending {msg_type}: {e}")
         except Exception as e:
-            logger.warning(f"Failed to send message ({msg_type}): {e}")
-            return False
+            logger.warning(f"Unexpected error sending {msg_type}: {e}")
+        return False
 
     
     async def _send_error(
         self, websocket: "WebSocketServerProtocol", error_msg: str
     ) -> None:
         """Send an error message to the client."""
-        await self._send_message(websocket, MessageType.ERROR, {"message": error_msg})
+        if (MessageType.ERROR, error_msg) in STATIC_ERROR_FRAMES:
+            await self._send_static_error(websocket, MessageType.ERROR, error_msg)
+        else:
+            await self._send_message(websocket, MessageType.ERROR, {"message": error_msg})
+    
+    async def _send_static_error(
+        self, websocket: "WebSocketServerProtocol", msg_type: MessageType, error_msg: str
+    ) -> bool:
+        """Send one of the pre-encoded STATIC_ERROR_FRAMES."""
+        if not self.connection_manager.is_connected(websocket):
+            logger.debug("Cannot send %s: connection not active", msg_type)
+            return False
+        return await self._send_encoded(websocket, msg_type, STATIC_ERROR_FRAMES[(msg_type, error_msg)])
     
     async def _handle_health(
         self, websocket: "WebSocketServerProtocol", payload: JsonDict
     ) -> None:
-        """Handle health check request."""
-        metrics_dict = self.state.metrics.to_dict()
-        health_data: JsonDict = {
-            "status": self.state.status.value,
-            "active_connections": self.connection_manager.get_connection_count(),
-            "active_analyses": len(self.state.active_analyses),
-            "active_transcriptions": len(self.state.active_transcriptions),
-            "max_concurrent_analyses": self.max_concurrent_analyses,
-            "metrics": metrics_dict
-        }
-        await self._send_message(websocket, MessageType.STATUS, health_data)
+        """
+        Handle health check request.
+        
+        The encoded frame is built once and reused for every client until the
+        service status, state version, connection count or analysis limit changes.
+        """
+        if not self.connection_manager.is_connected(websocket):
+            logger.debug("Cannot send %s: connection not active", MessageType.STATUS)
+            return
+        
+        health_key = (
+            self.state.status,
+            self.state.version,
+            self.connection_manager.get_connection_count(),
+            self.analysis_limiter.limit,
+        )
+        if self._health_frame is None or health_key != self._health_key:
+            health_data: JsonDict = {
+                "status": self.state.status,
+                "active_connections": health_key[2],
+                "active_analyses": len(self.state.active_analyses),
+                "active_transcriptions": len(self.state.active_transcriptions),
+                "max_concurrent_analyses": health_key[3],
+                "metrics": self.state.metrics.to_dict()
+            }
+            self._health_frame = encode_frame({"type": MessageType.STATUS, "payload": health_data})
+            self._health_key = health_key
+        
+        await self._send_encoded(websocket, MessageType.STATUS, self._health_frame)
+    
+    async def _handle_configure(
+        self, websocket: "WebSocketServerProtocol", payload: JsonDict
+    ) -> None:
+        """
+        Handle a runtime settings change, then reply with the health status.
+        
+        max_concurrent_analyses can be lowered and raised again up to the
+        process pool size set at startup.
+        """
+        limit = payload.get("max_concurrent_analyses")
+        if limit is not None:
+            if not isinstance(limit, int) or not 1 <= limit <= self.max_concurrent_analyses:
+                await self._send_error(
+                    websocket,
+                    f"max_concurrent_analyses must be between 1 and {self.max_concurrent_analyses}"
+                )
+                return
+            await self.analysis_limiter.set_limit(limit)
+            logger.info("Max concurrent analyses set to %d", limit)
+        
+        await self._handle_health(websocket, payload)
     
     async def _handle_analyze(
         self, websocket: "WebSocketServerProtocol", payload: JsonDict
@@ -371,25 +996,30 @@ class MessageHandler:
         video_path_str = payload.get("video_path")
         if not isinstance(video_path_str, str):
             logger.error("Missing or invalid 'video_path' in payload")
-            await self._send_message(
+            await self._send_static_error(
                 websocket,
                 MessageType.ANALYSIS_ERROR,
-                {"message": "Missing or invalid 'video_path' in payload"}
+                "Missing or invalid 'video_path' in payload"
             )
             return
         
         job_id = payload.get("job_id") 
         if not isinstance(job_id, str):
             logger.error("Missing or invalid 'job_id' in payload")
-            await self._send_message(
+            await self._send_static_error(
                 websocket,
                 MessageType.ANALYSIS_ERROR,
-                {"message": "Missing or invalid 'job_id' in payload"}
+                "Missing or invalid 'job_id' in payload"
             )
             return
             
         video_path = Path(video_path_str)
-        if not video_path.exists():
+        try:
+            # Off the loop: a slow or network filesystem must not stall other clients
+            video_path_normalized, video_key = await asyncio.get_running_loop().run_in_executor(
+                None, locate_video, video_path_str
+            )
+        except OSError:
             logger.error(f"Video file not found: {video_path}")
             await self._send_message(
                 websocket,
@@ -399,9 +1029,7 @@ class MessageHandler:
             )
             return
         
-        video_path_normalized = str(video_path.resolve())
-        
-        if self.state.is_processing_video(video_path_normalized):
+        if self.state.is_processing_video(video_key):
             logger.warning(f"Video already being analyzed: {video_path.name}")
             await self._send_message(
                 websocket,
@@ -415,10 +1043,18 @@ class MessageHandler:
         settings_dict = settings if isinstance(settings, dict) else {}
         config = self._build_analysis_config(settings_dict)
         
-        logger.info(f"Starting analysis for: {video_path.name} with {len(settings_dict)} custom settings")
+        logger.info("Starting analysis for: %s with %d custom settings", video_path.name, len(settings_dict))
         
-        async with self.analysis_semaphore:
-                await self._run_analysis_workflow(websocket, video_path, video_path_normalized, config, job_id)
+        # Claim the video before waiting for a slot: the check above and this add
+        # have no await between them, so a duplicate request queued behind the
+        # limiter is rejected instead of analyzing the same video twice
+        self.state.start_analysis(video_key, video_path_normalized)
+        success = False
+        try:
+            async with self.analysis_limiter:
+                success = await self._run_analysis_workflow(websocket, video_path, video_path_normalized, config, job_id)
+        finally:
+            self.state.finish_analysis(video_key, success)
                 
     async def _run_analysis_workflow(
         self,
@@ -427,35 +1063,55 @@ class MessageHandler:
         video_path_normalized: str,
         config: "AnalysisConfig",
         job_id: str,
-    ) -> None:
-        """Execute the complete analysis workflow with proper cleanup."""
-        self.state.start_analysis(video_path_normalized)
-        analyzer: Optional[VideoAnalyzer] = None
+    ) -> bool:
+        """
+        Execute the complete analysis workflow with proper cleanup.
+        
+        Returns:
+            True if the analysis completed and its result was sent.
+        """
         guard: Optional[CallbackGuard] = None
+        progress_sender: Optional[ProgressSender] = None
         success = False
         
         try:
-            guard = CallbackGuard(websocket, self.connection_manager)
-            self.active_guards.add(guard)
+            guard = self._create_guard(websocket)
+            progress_sender = ProgressSender(
+                asyncio.get_running_loop(),
+                functools.partial(self._send_progress, websocket, MessageType.ANALYSIS_PROGRESS, job_id=job_id)
+            )
             
-            analyzer = VideoAnalyzer(video_path_normalized, config)
-            result = await self._execute_analysis(websocket, analyzer, guard, job_id)
+            outcome = await self._execute_analysis(
+                websocket, video_path_normalized, config, guard, job_id, progress_sender
+            )
+            result_json = outcome.result_json
+            if not outcome.error and result_json is None:
+                try:
+                    result_json = await asyncio.get_running_loop().run_in_executor(
+                        None, Path(outcome.output_path).read_bytes
+                    )
+                except OSError as e:
+                    outcome.error = f"Could not read saved result: {e}"
             
-            if result.error:
-                await self._send_message(
-                    websocket,
-                    MessageType.ANALYSIS_ERROR,
-                    {"message": f"Analysis failed: {result.error}"},
-                    job_id=job_id
-                )
-            else:
-                output_path = OutputManager.get_output_path(video_path_normalized, config.output_dir)
-                OutputManager.save_result(result, output_path)
-                logger.info(f"Analysis complete. Results saved to: {output_path}")
-                
-                result_dict = result.to_dict()
-                if isinstance(result_dict, dict):
-                    await self._send_message(websocket, MessageType.ANALYSIS_COMPLETED, result_dict, job_id=job_id)  
+            # The last progress frame and the result leave in the same segments
+            with tcp_cork(websocket):
+                await progress_sender.close()
+                if outcome.error or result_json is None:
+                    await self._send_message(
+                        websocket,
+                        MessageType.ANALYSIS_ERROR,
+                        {"message": f"Analysis failed: {outcome.error}"},
+                        job_id=job_id
+                    )
+                else:
+                    logger.info("Analysis complete. Results saved to: %s", outcome.output_path)
+                    # Fragments of one message, so the result is never copied into a frame buffer
+                    head = encode_frame({"type": MessageType.ANALYSIS_COMPLETED, "job_id": job_id})
+                    await self._send_encoded(
+                        websocket,
+                        MessageType.ANALYSIS_COMPLETED,
+                        [head[:-1] + b',"payload":', result_json, b"}"]
+                    )
                     success = True
         
         except (BrokenPipeError, OSError) as e:
@@ -470,57 +1126,112 @@ class MessageHandler:
                 job_id=job_id
             )
         finally:
+            if progress_sender:
+                await progress_sender.close()
             if guard:
-                guard.cancel()
-                self.active_guards.discard(guard)
-            self.state.finish_analysis(video_path_normalized, success)
-            if analyzer:
-                analyzer.progress_callback = None
-                del analyzer
+                self._release_guard(guard)
+        return success
+    
     async def _execute_analysis(
         self,
         websocket: "WebSocketServerProtocol",
-        analyzer: "VideoAnalyzer",
+        video_path_normalized: str,
+        config: "AnalysisConfig",
         guard: "CallbackGuard",
         job_id: str,
-    ) -> "VideoAnalysisResult":
-        """Execute video analysis with progress updates."""
+        progress_sender: "ProgressSender",
+    ) -> "AnalysisOutcome":
+        """
+        Execute video analysis in the process pool, publishing its progress.
+        
+        The caller closes progress_sender, so it can flush the last update
+        together with the result.
+        """
         loop = asyncio.get_running_loop()
+        manager = await self._get_mp_manager()
+        # Queue() is a round trip to the manager process, so it stays off the loop too
+        progress_queue = await loop.run_in_executor(None, manager.Queue)
+        # A plain executor future rather than a Task: the relay blocks on the queue in a thread
+        forwarder = loop.run_in_executor(None, self._forward_analysis_progress, progress_queue, progress_sender)
         
-        def progress_callback(
-            progress: float,
-            elapsed: float,
-            frames_analyzed: float,
-            total_frames: float
-        ) -> None:
-            """Thread-safe progress callback for analyzer with robust error handling."""
+        pool = self.analysis_pool
+        try:
+            return await loop.run_in_executor(
+                pool, run_analysis_job, video_path_normalized, config, job_id, progress_queue
+            )
+        except BrokenProcessPool as e:
+            # A worker died (crash, OOM kill); only this job fails, later ones get a new pool
+            logger.error(f"Analysis worker process died during job {job_id}: {e}")
+            self._replace_broken_pool(pool)
+            return AnalysisOutcome(error="Analysis worker process terminated unexpectedly")
+        finally:
+            # The worker's puts have all landed by now; the sentinel stops the forwarder
+            await loop.run_in_executor(None, progress_queue.put, None)
+            await forwarder
+    
+    def _forward_analysis_progress(
+        self, progress_queue: "queue.Queue[Optional[Tuple[float, float, float, float]]]", progress_sender: "ProgressSender"
+    ) -> None:
+        """
+        Relay progress ticks from an analysis worker process until the None sentinel.
+        
+        Runs in an executor thread for the whole job. ProgressSender.publish is
+        thread-safe, so ticks reach the loop without a Task or an executor hop
+        per read, and ticks that piled up between reads are dropped here.
+        """
+        finished = False
+        while not finished:
+            progress, finished = get_latest_progress(progress_queue)
+            if progress is None:
+                continue
+            
+            progress_value, elapsed, frames_analyzed, total_frames = progress
             progress_data: JsonDict = {
-                "progress": progress,
+                "progress": progress_value,
                 "frames_analyzed": frames_analyzed,
                 "elapsed": elapsed,
                 "total_frames": total_frames
             }
-            asyncio.run_coroutine_threadsafe(
-                self._send_message(websocket, MessageType.ANALYSIS_PROGRESS, progress_data, job_id=job_id),
-                loop
-            )
-            logger.debug(f"Sent Analysis progress: {progress_data}")
-         
+            progress_sender.publish(progress_data)
+            logger.debug("Queued Analysis progress: %s", progress_data)
+    
+    def _replace_broken_pool(self, broken_pool: ProcessPoolExecutor) -> None:
+        """
+        Swap in a fresh process pool after a worker died.
         
+        Every job running on the broken pool fails with BrokenProcessPool, but
+        only the first one to get here still sees it as the current pool, so
+        the pool is rebuilt once. The check and swap run on the event loop
+        without awaiting in between.
+        """
+        if self.analysis_pool is not broken_pool:
+            return
+        logger.warning("Restarting analysis process pool")
+        broken_pool.shutdown(wait=False, cancel_futures=True)
+        self.analysis_pool = ProcessPoolExecutor(
+            max_workers=self.max_concurrent_analyses, mp_context=self._mp_context
+        )
+    
+    async def _get_mp_manager(self) -> "SyncManager":
+        """
+        Start the manager that hosts per-job progress queues on first use.
         
-        try:
-            analyzer.progress_callback = progress_callback
-
-            result = await loop.run_in_executor(None, analyzer.analyze)
-            result_dict = result.to_dict()
-            try:
-                await self._send_message(websocket, MessageType.ANALYSIS_COMPLETED, result_dict, job_id=job_id)
-            except Exception as e:
-                logger.warning(f"Failed to send frame analysis complete event: {e}")
-
-            return result
-        finally:
-            analyzer.progress_callback = None
+        Starting it spawns a process and waits for it to come up, so that runs
+        in an executor; the lock keeps concurrent first jobs from starting two.
+        """
+        async with self._mp_manager_lock:
+            if self._mp_manager is None:
+                self._mp_manager = await asyncio.get_running_loop().run_in_executor(
+                    None, self._mp_context.Manager
+                )
+        return self._mp_manager
+    
+    def shutdown(self) -> None:
+        """Stop the analysis worker processes."""
+        self.analysis_pool.shutdown(wait=False, cancel_futures=True)
+        if self._mp_manager is not None:
+            self._mp_manager.shutdown()
+            self._mp_manager = None
 
     
     def _build_analysis_config(
@@ -545,10 +1256,10 @@ class MessageHandler:
         json_file_path = payload.get("json_file_path")
 
         if not isinstance(video_path, str) or not isinstance(json_file_path, str):
-            await self._send_message(
+            await self._send_static_error(
                 websocket,
                 MessageType.TRANSCRIPTION_ERROR,
-                {"message": "Missing or invalid 'video_path' or 'json_file_path' in payload"}
+                "Missing or invalid 'video_path' or 'json_file_path' in payload"
             )
             logger.error(f"Invalid transcription request payload: {payload}")
             return
@@ -558,44 +1269,45 @@ class MessageHandler:
             logger.error("Missing or invalid 'job_id' in payload")
             job_id = None  # Continue but log the issue
             
-        video_path_normalized = str(Path(video_path).resolve())
+        loop = asyncio.get_running_loop()
+        video_path_normalized = await loop.run_in_executor(None, resolve_path, video_path)
         self.state.start_transcription(video_path_normalized)
-        logger.info(f"Started transcription for: {video_path_normalized}")
 
-        loop = asyncio.get_running_loop()
+        progress_sender = ProgressSender(
+            loop,
+            functools.partial(self._send_progress, websocket, MessageType.TRANSCRIPTION_PROGRESS, job_id=job_id)
+        )
 
-        def progress_callback(progress: int, elapsed: str) -> None:
-            """Thread-safe callback for sending transcription progress."""
+        def progress_callback(progress: int, elapsed: int) -> None:
+            """Thread-safe callback for sending transcription progress; elapsed is in seconds."""
             progress_data: JsonDict = {
                 "progress": progress,
                 "elapsed": elapsed,
                 "video_path": video_path_normalized
             }
-            asyncio.run_coroutine_threadsafe(
-                self._send_message(websocket, MessageType.TRANSCRIPTION_PROGRESS, progress_data, job_id=job_id),
-                loop
-            )
+            progress_sender.publish(progress_data)
         try:
-            logger.info(f"Running transcription for {video_path_normalized}")
             result = await loop.run_in_executor(
                 None,
-                lambda: self.transcription_service.transcribe(
+                functools.partial(
+                    self.transcription_service.transcribe,
                     video_path,
                     json_file_path,
                     progress_callback
                 )
             )
-
             complete_data: JsonDict = {
                 "json_file_path": json_file_path,
                 "language": getattr(result, "language", "unknown"),
                 "video_path": video_path_normalized
             }
-            try:
-                await self._send_message(websocket, MessageType.TRANSCRIPTION_COMPLETED, complete_data, job_id=job_id)
-                logger.info(f"Transcription complete for {video_path_normalized} -> {json_file_path}")
-            except Exception as e:
-                logger.warning(f"Failed to send transcription complete event: {e}")
+            with tcp_cork(websocket):
+                await progress_sender.close()
+                try:
+                    await self._send_message(websocket, MessageType.TRANSCRIPTION_COMPLETED, complete_data, job_id=job_id)
+                    logger.info("Transcription complete for %s -> %s", video_path_normalized, json_file_path)
+                except Exception as e:
+                    logger.warning(f"Failed to send transcription complete event: {e}")
 
         except Exception as e:
             logger.exception(f"Transcription failed for {video_path_normalized}")
@@ -606,6 +1318,7 @@ class MessageHandler:
                 job_id=job_id
             )
         finally:
+            await progress_sender.close()
             self.state.finish_transcription(video_path_normalized)
             
     async def _handle_find_matching_faces(
@@ -618,18 +1331,18 @@ class MessageHandler:
         tolerance = payload.get("tolerance", 0.6)
         
         if not isinstance(person_name, str) or not person_name:
-            await self._send_message(
+            await self._send_static_error(
                 websocket,
                 MessageType.FACE_MATCHING_ERROR,
-                {"message": "Missing or invalid 'person_name'"}
+                "Missing or invalid 'person_name'"
             )
             return
         
         if not isinstance(reference_images, list) or not reference_images:
-            await self._send_message(
+            await self._send_static_error(
                 websocket,
                 MessageType.FACE_MATCHING_ERROR,
-                {"message": "Missing or invalid 'reference_images'"}
+                "Missing or invalid 'reference_images'"
             )
             return
         
@@ -640,10 +1353,17 @@ class MessageHandler:
         
         logger.info(f"Starting face matching for {person_name} with {len(reference_images)} references")
         
-        guard = CallbackGuard(websocket, self.connection_manager)
-        self.active_guards.add(guard)
+        guard = self._create_guard(websocket)
         
         loop = asyncio.get_running_loop()
+        # Each update carries a match, so send every one rather than coalescing;
+        # updates that pile up during a send go out together as one batch frame
+        progress_sender = ProgressSender(
+            loop,
+            functools.partial(self._send_message, websocket, MessageType.FACE_MATCHING_PROGRESS, job_id=job_id),
+            coalesce=False,
+            send_batch=functools.partial(self._send_batch, websocket, MessageType.FACE_MATCHING_PROGRESS, job_id=job_id)
+        )
         
         def progress_callback(data: Dict[str, str]) -> None:
             """Thread-safe synchronous progress callback for face matching."""            
@@ -651,12 +1371,8 @@ class MessageHandler:
                 "person_name": person_name,
                 **data
             }
-       
-            asyncio.run_coroutine_threadsafe(
-                self._send_message(websocket, MessageType.FACE_MATCHING_PROGRESS, progress_data, job_id=job_id),
-                loop
-            )
-            logger.debug(f"Sent face matching progress: {progress_data}")
+            progress_sender.publish(progress_data)
+            logger.debug("Queued face matching progress: %s", progress_data)
           
         
         try:
@@ -670,6 +1386,7 @@ class MessageHandler:
                 tolerance=tolerance,
                 progress_callback=progress_callback
             )
+            await progress_sender.close()
             
             if result["success"]:
                 logger.info(f"Face matching complete: {result['matches_found']} matches found for {person_name}")
@@ -705,8 +1422,8 @@ class MessageHandler:
                 job_id=job_id
             )
         finally:
-            guard.cancel()
-            self.active_guards.discard(guard)
+            await progress_sender.close()
+            self._release_guard(guard)
 
 
     async def _handle_reindex_faces(
@@ -715,10 +1432,10 @@ class MessageHandler:
         """Handle face reindexing request with exclusive locking."""
         if self.reindex_lock.locked():
             logger.warning("Reindex request received while another reindex is active.")
-            await self._send_message(
+            await self._send_static_error(
                 websocket,
                 MessageType.REINDEX_ERROR,
-                {"message": "Face reindexing is already in progress. Please wait."}
+                "Face reindexing is already in progress. Please wait."
             )
             return
 
@@ -739,10 +1456,13 @@ class MessageHandler:
             if not isinstance(known_faces_f, str):
                 known_faces_f = "known_faces.json"
             
-            guard = CallbackGuard(websocket, self.connection_manager)
-            self.active_guards.add(guard)
+            guard = self._create_guard(websocket)
             
             loop = asyncio.get_running_loop()
+            progress_sender = ProgressSender(
+                loop,
+                functools.partial(self._send_progress, websocket, MessageType.REINDEX_PROGRESS, job_id=job_id)
+            )
             
             def reindex_progress_callback(data: Dict[str, Union[str, int]]) -> None:
                 """Thread-safe synchronous progress callback for reindexing."""
@@ -762,11 +1482,7 @@ class MessageHandler:
                     "progress": progress
                 }
                 
-                asyncio.run_coroutine_threadsafe(
-                    self._send_message(websocket, MessageType.REINDEX_PROGRESS, progress_data, job_id=job_id),
-                    loop
-                    )
-               
+                progress_sender.publish(progress_data)
 
             try:
                 logger.info("Running face reindexing")
@@ -774,6 +1490,7 @@ class MessageHandler:
                     progress_callback=reindex_progress_callback,
                     specific_faces=specific_faces
                 )
+                await progress_sender.close()
                 
                 if success:
                     logger.info("Face reindexing completed successfully.")
@@ -808,8 +1525,8 @@ class MessageHandler:
                     job_id=job_id
                 )
             finally:
-                guard.cancel()
-                self.active_guards.discard(guard)
+                await progress_sender.close()
+                self._release_guard(guard)
 class WebSocketHandler:
     """Coordinates WebSocket connections and message processing."""
     
@@ -820,39 +1537,36 @@ class WebSocketHandler:
         self.message_handler: "MessageHandler" = MessageHandler(
             service_state, self.connection_manager, max_concurrent_analyses
         )
+        # Sequence number that tells apart connections from the same address
+        self._conn_seq: Iterator[int] = itertools.count()
+    
+    @staticmethod
+    def _disable_nagle(websocket: "WebSocketServerProtocol") -> None:
+        """Send small progress frames immediately instead of waiting to coalesce them."""
+        sock = websocket.transport.get_extra_info("socket")
+        if sock is not None and sock.family in (socket.AF_INET, socket.AF_INET6):
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
     
     async def handle_connection(self, websocket: "WebSocketServerProtocol") -> None:
         """Handle incoming WebSocket connection lifecycle."""
-        await self.connection_manager.register(websocket)
+        self._disable_nagle(websocket)
+        self.connection_manager.register(websocket)
         client_addr = websocket.remote_address
-        connection_id = f"{client_addr}_{datetime.now().strftime('%H%M%S%f')}"
-        async def heartbeat():
-            try:
-                while True:
-                    if websocket.closed:
-                        break
-                    await websocket.send(json.dumps({"type": "ping", "ts": datetime.now().isoformat()}))
-                    await asyncio.sleep(30)  # send heartbeat every 30s
-            except Exception:
-                pass
-        heartbeat_task = asyncio.create_task(heartbeat())
+        connection_id = f"{client_addr}-{next(self._conn_seq)}"
         try:
             async for message in websocket:
-                if isinstance(message, str):
-                    try:
-                        data = json.loads(message)
-                    except json.JSONDecodeError:
-                        logger.warning(f"Received non-JSON string from {connection_id}")
-                        continue
+                # Parse once here; the handler gets the decoded message
+                try:
+                    data = decode_frame(message)
+                except ValueError:
+                    logger.warning(f"Received non-JSON message from {connection_id}")
+                    continue
 
-                    if data.get("type") == "ping":
-                        await websocket.send(json.dumps({"type": "pong"}))
-                        continue
+                if isinstance(data, dict) and data.get("type") == "ping":
+                    await websocket.send(PONG_FRAME)
+                    continue
 
-                    await self.message_handler.process_message(websocket, message)
-
-                else:
-                    logger.warning(f"Received non-string message from {connection_id}")
+                await self.message_handler.dispatch_message(websocket, data)
 
         except ConnectionClosedOK:
             logger.info(f"Client disconnected normally: {connection_id}")
@@ -864,9 +1578,21 @@ class WebSocketHandler:
             logger.exception(f"Unhandled exception in WebSocket handler for {connection_id}")
         finally:
             # Cancel all callbacks for this connection
-            heartbeat_task.cancel()
             self.message_handler.cleanup_guards(websocket)
-            await self.connection_manager.unregister(websocket)
+            self.connection_manager.unregister(websocket)
+
+
+class HandshakeLimitedProtocol(WebSocketServerProtocol):
+    """Server protocol that waits for a free slot before its opening handshake."""
+    
+    def __init__(self, *args: object, handshake_limiter: asyncio.Semaphore, **kwargs: object) -> None:
+        super().__init__(*args, **kwargs)
+        self.handshake_limiter: asyncio.Semaphore = handshake_limiter
+    
+    async def handshake(self, *args: object, **kwargs: object) -> str:
+        # Only the upgrade is gated; the slot is free again before the handler runs
+        async with self.handshake_limiter:
+            return await super().handshake(*args, **kwargs)
 
 
 class AnalysisService:
@@ -877,17 +1603,49 @@ class AnalysisService:
         self.handler: "WebSocketHandler" = WebSocketHandler(
             self.state, max_concurrent_analyses
         )
+        # Opt-in cap on simultaneous opening handshakes, for bursts of new clients
+        max_handshakes = os.getenv("EDIT_MIND_WS_MAX_HANDSHAKES")
+        self.max_handshakes: Optional[int] = int(max_handshakes) if max_handshakes else None
         logger.info(
             f"Service initialized (max concurrent analyses: {max_concurrent_analyses})"
         )
     
+    def shutdown(self) -> None:
+        """Release worker processes held by the service."""
+        self.handler.message_handler.shutdown()
+    
     async def start(
         self,
         host: Optional[str] = None,
         port: Optional[int] = None,
         socket_path: Optional[str] = None,
+        reuse_port: bool = False,
     ) -> None:
-        """Start the WebSocket server."""
+        """
+        Start the WebSocket server.
+        
+        reuse_port binds the TCP port with SO_REUSEPORT so other worker
+        processes can listen on it too.
+        """
+        # Clients that offer no subprotocol are still accepted and get JSON frames
+        subprotocols = [MSGPACK_SUBPROTOCOL] if HAS_MSGPACK else None
+        server_options = {
+            # Liveness is left to WebSocket protocol pings; there is no application heartbeat
+            "ping_interval": SERVER_PING_INTERVAL,
+            "ping_timeout": SERVER_PING_TIMEOUT,
+            "compression": None,
+            "subprotocols": subprotocols,
+            # Full analysis results go out as one frame; a larger write buffer lets
+            # them be handed to the transport without pausing on drain
+            "write_limit": SERVER_WRITE_LIMIT,
+            "max_size": SERVER_MAX_MESSAGE_SIZE,
+        }
+        if self.max_handshakes:
+            server_options["create_protocol"] = functools.partial(
+                HandshakeLimitedProtocol, handshake_limiter=asyncio.Semaphore(self.max_handshakes)
+            )
+            logger.info(f"Limiting concurrent WebSocket handshakes to {self.max_handshakes}")
+        
         if socket_path:
             path = Path(socket_path)
             if path.exists():
@@ -895,13 +1653,14 @@ class AnalysisService:
                 path.unlink()
             
             logger.info(f"Starting service on Unix Domain Socket: {socket_path}")
-            async with websockets.unix_serve(self.handler.handle_connection, socket_path):
+            async with websockets.unix_serve(self.handler.handle_connection, socket_path, **server_options):
                 logger.info(f"Server listening on {socket_path}")
                 await asyncio.Future()  # Run forever
         
         elif host and port:
             logger.info(f"Starting service on {host}:{port}")
-            async with websockets.serve(self.handler.handle_connection, host, port,ping_interval=60,ping_timeout=120,close_timeout=30,max_queue=None):
+            sock = create_tcp_listener(host, port, reuse_port)
+            async with websockets.serve(self.handler.handle_connection, sock=sock,close_timeout=30,max_queue=None,**server_options):
                 logger.info(f"Server listening on {host}:{port}")
                 await asyncio.Future()  # Run forever
     
@@ -939,37 +1698,115 @@ def parse_arguments() -> argparse.Namespace:
         default=3,
         help="Maximum number of concurrent video analyses (default: 3)"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of service processes sharing the TCP port (default: 1). "
+             "Each worker has its own analysis pool and state"
+    )
 
     args = parser.parse_args()
 
     # Validate combination
     if not args.socket and not (args.host and args.port):
         parser.error("You must specify either --socket OR both --host and --port")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.workers > 1:
+        if args.socket:
+            parser.error("--workers requires --host and --port")
+        if not (hasattr(os, "fork") and hasattr(socket, "SO_REUSEPORT")):
+            parser.error("--workers is not supported on this platform")
 
     return args
 
 
-async def main() -> None:
+async def main(args: argparse.Namespace) -> None:
     """Application entry point."""
-    args = parse_arguments()
-
     service = AnalysisService(max_concurrent_analyses=args.max_concurrent)
 
     try:
         if args.socket:
             await service.start(socket_path=args.socket)
         else:
-            await service.start(host=args.host, port=args.port)
+            await service.start(host=args.host, port=args.port, reuse_port=args.workers > 1)
     except KeyboardInterrupt:
         logger.info("Service stopped by user")
     except Exception as e:
         logger.exception(f"Service failed to start: {e}")
         raise
+    finally:
+        service.shutdown()
+
+
+def run_event_loop(coro: Awaitable[None]) -> None:
+    """
+    Run the service coroutine on uvloop when available.
+    
+    uvloop.run is preferred on Python 3.11+, where event loop policies are
+    deprecated; older interpreters install the uvloop policy instead.
+    """
+    if not HAS_UVLOOP:
+        logger.info("uvloop not available. Using the default asyncio event loop.")
+        asyncio.run(coro)
+    elif sys.version_info >= (3, 11) and hasattr(uvloop, "run"):
+        uvloop.run(coro)
+    else:
+        # libuv-backed loop: cheaper transport writes and thread-safe wakeups for progress frames
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        asyncio.run(coro)
+
+
+def run_workers(args: argparse.Namespace) -> int:
+    """
+    Fork args.workers service processes that share the TCP port and wait for them.
+    
+    The parent only supervises: SIGTERM is forwarded to the workers, and
+    SIGINT is ignored since a terminal delivers it to every worker directly.
+    
+    Returns:
+        Exit code of the first worker that failed, or 0
+    """
+    workers: List[int] = []
+    for _ in range(args.workers):
+        pid = os.fork()
+        if pid == 0:
+            exit_code = 0
+            try:
+                run_event_loop(main(args))
+            except KeyboardInterrupt:
+                pass
+            except Exception as e:
+                logger.exception(f"Worker {os.getpid()} failed: {e}")
+                exit_code = 1
+            os._exit(exit_code)
+        workers.append(pid)
+    logger.info(f"Started {len(workers)} workers: {workers}")
+
+    def forward_signal(signum: int, frame: object) -> None:
+        for pid in workers:
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, forward_signal)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    exit_code = 0
+    for pid in workers:
+        _, status = os.waitpid(pid, 0)
+        exit_code = exit_code or os.waitstatus_to_exitcode(status)
+    return exit_code
 
 
 if __name__ == "__main__":
+    args = parse_arguments()
+    if args.workers > 1:
+        sys.exit(run_workers(args))
     try:
-        asyncio.run(main())
+        run_event_loop(main(args))
     except KeyboardInterrupt:
         logger.info("Service stopped")
         sys.exit(0)
@@ -1,19 +1,25 @@
 import sys
 import json
 import importlib
+import os
 import inspect
-from dataclasses import dataclass, asdict
-from typing import List, Dict, Optional, Tuple, Iterator, Callable, Union
+import io
+import contextlib
+import copy
+import functools
+import threading
+from dataclasses import dataclass, asdict, fields
+from typing import List, Dict, Optional, Tuple, Iterator, Callable, Union, TypeVar, NamedTuple, BinaryIO
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor
 import time
 import warnings
 import logging
 import math
+import queue
 
 import cv2
 import numpy as np
-from tqdm import tqdm
 import gc
 from plugins.base import AnalyzerPlugin, FrameAnalysis
 
@@ -33,9 +39,42 @@ except ImportError:
     HAS_PSUTIL = False
     logger.warning("psutil not installed. Memory tracking disabled.")
 
+try:
+    import av
+    HAS_AV = True
+except ImportError:
+    HAS_AV = False
+    logger.debug("PyAV not installed. Decoding video with OpenCV.")
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+    logger.debug("orjson not installed. Saving results with stdlib json.")
+
 from plugins.base import AnalyzerPlugin
 
 
+SETTINGS_PATH = Path(__file__).parent.parent / 'settings.json'
+
+
+@functools.lru_cache(maxsize=1)
+def _read_settings(path: str, mtime_ns: int, size: int) -> Dict[str, object]:
+    """Parse settings.json once per version of the file, identified by mtime and size."""
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+@functools.lru_cache(maxsize=1)
+def _startup_available_memory_gb() -> float:
+    """
+    Available memory when the first config was built. Config defaults are a
+    one-shot sizing heuristic; the per-batch memory checks stay live.
+    """
+    return psutil.virtual_memory().available / (1024**3)
+
+
 @dataclass
 class AnalysisConfig:
     """Video analysis configuration with environment-based overrides."""
@@ -46,6 +85,8 @@ class AnalysisConfig:
     yolo_iou: float = 0.45
     known_faces_file: str = 'known_faces.json'
     yolo_model: str = 'yolov8s.pt'
+    yolo_onnx: bool = True
+    quantization: Optional[str] = None
     output_dir: str = 'analysis_results'
     unknown_faces_dir: str = 'unknown_faces'
     enable_streaming: bool = True
@@ -57,6 +98,7 @@ class AnalysisConfig:
     memory_cleanup_interval: int = 50
     lazy_plugin_init: bool = True
     target_resolution_height: int = 720 
+    video_hwaccel: Optional[str] = 'auto'
     plugin_skip_interval: Optional[Dict[str, int]] = None
     
     def __post_init__(self) -> None:
@@ -73,16 +115,17 @@ class AnalysisConfig:
 
     def _load_settings(self) -> None:
         """Load settings from external JSON file if available."""
-        settings_path = Path(__file__).parent.parent / 'settings.json'
-        if not settings_path.exists():
+        try:
+            stat = SETTINGS_PATH.stat()
+        except FileNotFoundError:
             return
             
         try:
-            with open(settings_path, 'r') as f:
-                settings = json.load(f)
-                for key, value in settings.items():
-                    if hasattr(self, key):
-                        setattr(self, key, value)
+            settings = _read_settings(str(SETTINGS_PATH), stat.st_mtime_ns, stat.st_size)
+            for key, value in settings.items():
+                if hasattr(self, key):
+                    # The parsed settings are shared between configs; copy nested values
+                    setattr(self, key, copy.deepcopy(value))
         except Exception as e:
             logger.warning(f"Failed to load settings.json: {e}")
 
@@ -91,7 +134,7 @@ class AnalysisConfig:
         if not HAS_PSUTIL:
             return
             
-        available_gb = psutil.virtual_memory().available / (1024**3)
+        available_gb = _startup_available_memory_gb()
         if available_gb < 8:
             self.max_workers = 2
             self.frame_buffer_limit = 4
@@ -153,23 +196,10 @@ class VideoAnalysisResult:
     performance_metrics: Optional[List[Dict[str, Union[str, int, float]]]] = None
     error: Optional[str] = None
 
-    def to_dict(self) -> Dict[str, Union[str, int, float, bool, List, Dict, None]]:
-        """Convert to JSON-serializable dictionary."""
-        data_dict = asdict(self)
-        return self._convert_numpy_types(data_dict)
 
-    @staticmethod
-    def _convert_numpy_types(obj: Union[Dict, List, np.bool_, np.int_, np.float_, np.ndarray, str, int, float, bool, None]) -> Union[Dict, List, str, int, float, bool, None]:
-        """Recursively convert NumPy types to Python native types."""
-        if isinstance(obj, dict):
-            return {k: VideoAnalysisResult._convert_numpy_types(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [VideoAnalysisResult._convert_numpy_types(elem) for elem in obj]
-        elif isinstance(obj, (np.bool_, np.int_, np.float_)):
-            return obj.item()
-        elif isinstance(obj, np.ndarray):
-            return obj.tolist()
-        return obj
+# Frame batches allocate many short-lived containers; a larger gen-0 threshold
+# avoids constant young collections while the periodic cleanup handles the rest
+GC_THRESHOLDS = (50000, 20, 20)
 
 
 class MemoryMonitor:
@@ -177,10 +207,12 @@ class MemoryMonitor:
     
     def __init__(self, config: AnalysisConfig) -> None:
         self.config: AnalysisConfig = config
+        if config.enable_aggressive_gc:
+            gc.set_threshold(*GC_THRESHOLDS)
         self.process: Optional['psutil.Process'] = psutil.Process() if HAS_PSUTIL else None
         self.peak_memory: float = 0.0
         self.cleanup_count: int = 0
-        self.last_cleanup_time: float = time.time()
+        self.last_cleanup_ns: int = time.perf_counter_ns()
 
     def get_memory_mb(self) -> float:
         """Get current memory usage in MB."""
@@ -195,12 +227,14 @@ class MemoryMonitor:
         if not self.config.enable_aggressive_gc:
             return
         
-        now = time.time()
-        if not aggressive and (now - self.last_cleanup_time) < 5.0:
+        now = time.perf_counter_ns()
+        if not aggressive and (now - self.last_cleanup_ns) < 5_000_000_000:
             return
         
-        self.last_cleanup_time = now
-        collected = gc.collect()
+        self.last_cleanup_ns = now
+        # Routine cleanups only sweep the young generations; a full collection
+        # walks every tracked object and is kept for memory pressure
+        collected = gc.collect() if aggressive else gc.collect(1)
         self.cleanup_count += 1
         
         try:
@@ -246,24 +280,76 @@ class MemoryMonitor:
         }
 
 
+class ProgressReporter:
+    """
+    Reports streaming progress to the progress callback and as a single-line
+    bar on stderr, at most about once per percent.
+    """
+
+    BAR_WIDTH = 30
+
+    def __init__(
+        self,
+        total: int,
+        callback: Optional[Callable[[float, float, float, float], None]] = None
+    ) -> None:
+        self.total: int = total
+        self.callback: Optional[Callable[[float, float, float, float], None]] = callback
+        self.n: int = 0
+        self.start_ns: int = time.perf_counter_ns()
+        self._step: int = max(1, total // 100)
+        self._next_report: int = 0
+
+    def __enter__(self) -> 'ProgressReporter':
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        if self.n:
+            sys.stderr.write("\n")
+            sys.stderr.flush()
+
+    def update(self, n: int = 1) -> None:
+        """Count n more processed frames and report if a step was crossed."""
+        self.n += n
+        if not self.total or (self.n < self._next_report and self.n < self.total):
+            return
+        self._next_report = self.n + self._step
+
+        elapsed = (time.perf_counter_ns() - self.start_ns) * 1e-9
+        progress_percent = min(100.0, (self.n / self.total) * 100.0)
+
+        if self.callback:
+            try:
+                self.callback(progress_percent, elapsed, float(self.n), float(self.total))
+            except Exception as e:
+                logger.debug(f"Progress callback error: {e}")
+
+        filled = int(self.BAR_WIDTH * progress_percent / 100)
+        sys.stderr.write(
+            f"\r  Processing [{'#' * filled}{' ' * (self.BAR_WIDTH - filled)}] "
+            f"{progress_percent:3.0f}% ({self.n}/{self.total})"
+        )
+        sys.stderr.flush()
+
+
 class StageTracker:
     """Context manager for performance tracking."""
     
     def __init__(self, analyzer: "VideoAnalyzer", stage_name: str) -> None:
         self.analyzer: VideoAnalyzer = analyzer
         self.stage_name: str = stage_name
-        self.start_time: Optional[float] = None
+        self.start_ns: int = 0
         self.start_memory: Optional[float] = None
         self.frames_processed: int = 0
 
     def __enter__(self) -> "StageTracker":
-        self.start_time = time.time()
+        self.start_ns = time.perf_counter_ns()
         self.start_memory = self.analyzer.memory_monitor.get_memory_mb()
         logger.info(f"Starting stage: {self.stage_name}")
         return self
 
     def __exit__(self, *args: object) -> None:
-        duration = time.time() - self.start_time
+        duration = (time.perf_counter_ns() - self.start_ns) * 1e-9
         end_memory = self.analyzer.memory_monitor.get_memory_mb()
         memory_delta = end_memory - self.start_memory if self.start_memory else None
         fps = self.frames_processed / duration if duration > 0 and self.frames_processed > 0 else 0.0
@@ -285,18 +371,225 @@ class StageTracker:
             logger.info(f"✓ {self.stage_name}: {duration:.2f}s | Mem: {end_memory:.0f}MB")
 
 
+class SampledFrame(NamedTuple):
+    """A preprocessed sampled frame and the span of video it stands for."""
+    frame: np.ndarray
+    frame_idx: int
+    timestamp_ms: int
+    end_timestamp_ms: int
+    scale_factor: float
+    original_size: Tuple[int, int]
+
+
+def sample_timestamps_ms(total_frames: int, sample_interval: int, fps: float) -> np.ndarray:
+    """
+    Start times of every sampled frame, plus the end of the last span, in ms.
+
+    Sample k covers [result[k], result[k + 1]).
+    """
+    bounds = np.append(np.arange(0, total_frames, sample_interval), total_frames)
+    return np.round(bounds / fps * 1000).astype(np.int64)
+
+
+T = TypeVar('T')
+
+
+class _ProducerError:
+    """Carries an exception raised on the producer thread to the consumer."""
+
+    def __init__(self, error: BaseException) -> None:
+        self.error: BaseException = error
+
+
+_PRODUCER_DONE = object()
+
+
+def prefetch(iterator: Iterator[T], maxsize: int) -> Iterator[T]:
+    """
+    Run an iterator on a background thread, keeping up to maxsize items ready.
+
+    Lets video decoding, which releases the GIL, overlap with plugin inference.
+    Exceptions from the iterator are re-raised in the consumer; a consumer that
+    stops early stops the producer and waits for it to close the iterator.
+    """
+    items: "queue.Queue[object]" = queue.Queue(maxsize=max(1, maxsize))
+    stopped = threading.Event()
+
+    def put(item: object) -> bool:
+        while not stopped.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce() -> None:
+        try:
+            for item in iterator:
+                if not put(item):
+                    return
+            put(_PRODUCER_DONE)
+        except BaseException as e:
+            put(_ProducerError(e))
+        finally:
+            close = getattr(iterator, 'close', None)
+            if close is not None:
+                close()
+
+    producer = threading.Thread(target=produce, name='frame-prefetch', daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = items.get()
+            if item is _PRODUCER_DONE:
+                return
+            if isinstance(item, _ProducerError):
+                raise item.error
+            yield item
+    finally:
+        stopped.set()
+        producer.join()
+
+
+def _av_hwaccel(device: Optional[str]) -> Optional['av.codec.hwaccel.HWAccel']:
+    """
+    Build the PyAV hardware decoder for a device type ("cuda", "videotoolbox",
+    "vaapi", ...); "auto" picks VideoToolbox on macOS and CUDA elsewhere.
+
+    Returns None when disabled or when PyAV is too old to support hwaccel (< 14).
+    """
+    if not device:
+        return None
+    if device == 'auto':
+        device = 'videotoolbox' if sys.platform == 'darwin' else 'cuda'
+
+    try:
+        from av.codec.hwaccel import HWAccel
+    except ImportError:
+        return None
+    return HWAccel(device_type=device, allow_software_fallback=True)
+
+
 class FrameProcessor:
     """Zero-disk-IO streaming frame extraction and preprocessing."""
 
     def __init__(self, config: AnalysisConfig) -> None:
         self.config: AnalysisConfig = config
         self.frame_count: int = 0
+        # Ring of output buffers at the processing size, plus one reused decode
+        # buffer, so steady-state extraction allocates no new frame arrays
+        self._pool: List[np.ndarray] = []
+        self._pool_index: int = 0
+        self._decode_buffer: Optional[np.ndarray] = None
+
+    def _next_buffer(self, shape: Tuple[int, ...]) -> np.ndarray:
+        """
+        Take the next output buffer from the ring.
+
+        Frames are decoded up to frame_buffer_limit ahead of the batch being
+        analyzed, so up to twice that many frames plus the one being produced
+        are alive at once; the ring is sized so none of them is overwritten.
+        """
+        slots = 2 * self.config.frame_buffer_limit + 1
+        if len(self._pool) != slots:
+            self._pool = [np.empty(0, dtype=np.uint8) for _ in range(slots)]
+            self._pool_index = 0
+
+        i = self._pool_index
+        self._pool_index = (i + 1) % slots
+        if self._pool[i].shape != shape:
+            self._pool[i] = np.empty(shape, dtype=np.uint8)
+        return self._pool[i]
 
     def extract_frames_streaming_generator(
         self, 
         video_path: str
-    ) -> Iterator[Tuple[Dict[str, Union[np.ndarray, int, float, Tuple[int, int]]], float, int]]:
-        """Memory-efficient streaming generator that yields frames directly."""
+    ) -> Iterator[SampledFrame]:
+        """
+        Memory-efficient streaming generator that yields frames directly.
+
+        Decodes with PyAV when installed, using the configured hardware decoder,
+        and falls back to OpenCV if PyAV fails before the first frame.
+        """
+        if HAS_AV:
+            yielded = False
+            try:
+                for item in self._extract_frames_av(video_path):
+                    yielded = True
+                    yield item
+                return
+            except Exception as e:
+                if yielded:
+                    logger.error(f"Error in frame extraction: {e}")
+                    raise
+                logger.warning(f"PyAV could not decode video ({e}), falling back to OpenCV")
+
+        yield from self._extract_frames_opencv(video_path)
+
+    def _extract_frames_av(
+        self,
+        video_path: str
+    ) -> Iterator[SampledFrame]:
+        """Decode with PyAV, converting only the sampled frames to BGR."""
+        hwaccel = _av_hwaccel(self.config.video_hwaccel)
+        try:
+            container = av.open(video_path, hwaccel=hwaccel) if hwaccel else av.open(video_path)
+        except Exception as e:
+            if hwaccel is None:
+                raise
+            logger.warning(f"Hardware decoding unavailable ({e}), using software decoding")
+            container = av.open(video_path)
+
+        try:
+            if not container.streams.video:
+                raise ValueError(f"No video stream in: {video_path}")
+            stream = container.streams.video[0]
+            # Frame and slice threading; libavcodec decodes on a single thread by default
+            stream.thread_type = "AUTO"
+
+            fps = float(stream.average_rate or stream.guessed_rate or 0)
+            if fps <= 0:
+                logger.warning("Invalid FPS detected, defaulting to 30")
+                fps = 30.0
+
+            total_frames = stream.frames
+            if total_frames <= 0 and container.duration:
+                total_frames = int(container.duration / av.time_base * fps)
+            if total_frames <= 0:
+                raise ValueError("Invalid video file: cannot determine frame count")
+
+            sample_interval = max(1, int(fps * self.config.sample_interval_seconds))
+            timestamps_ms = sample_timestamps_ms(total_frames, sample_interval, fps)
+
+            for frame_idx, frame in enumerate(container.decode(stream)):
+                if frame_idx >= total_frames:
+                    break
+                if frame_idx % sample_interval:
+                    continue
+
+                # Scale in the same swscale pass as the YUV to BGR conversion, so
+                # full-resolution BGR frames are never materialized
+                target_size = self._target_size(frame.width, frame.height)
+                if target_size:
+                    image = frame.reformat(
+                        width=target_size[0], height=target_size[1],
+                        format='bgr24', interpolation='BILINEAR'
+                    ).to_ndarray()
+                else:
+                    image = frame.to_ndarray(format='bgr24')
+
+                yield self._sample_frame(
+                    image, frame_idx, sample_interval, timestamps_ms, (frame.width, frame.height)
+                )
+        finally:
+            container.close()
+
+    def _extract_frames_opencv(
+        self,
+        video_path: str
+    ) -> Iterator[SampledFrame]:
+        """Decode with OpenCV's software decoder."""
         cap = cv2.VideoCapture(video_path)
         
         try:
@@ -313,32 +606,27 @@ class FrameProcessor:
                 raise ValueError("Invalid video file: cannot determine frame count")
             
             sample_interval = max(1, int(fps * self.config.sample_interval_seconds))
+            timestamps_ms = sample_timestamps_ms(total_frames, sample_interval, fps)
             
-            for frame_idx in range(0, total_frames, sample_interval):
-                cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
-                ret, frame = cap.read()
+            # Decode sequentially instead of seeking: every seek restarts decoding
+            # from the previous keyframe, while grab() skips the BGR conversion
+            # for frames that are not sampled.
+            for frame_idx in range(total_frames):
+                if not cap.grab():
+                    if frame_idx % sample_interval == 0:
+                        logger.warning(f"Failed to read frame at index {frame_idx}")
+                    break
 
+                if frame_idx % sample_interval:
+                    continue
+
+                ret, frame = cap.retrieve(self._decode_buffer)
                 if not ret:
                     logger.warning(f"Failed to read frame at index {frame_idx}")
                     break
 
-                processed_frame, scale_factor, original_size = self._preprocess_frame(frame)
-                
-                timestamp_ms = round((frame_idx / fps) * 1000)
-                next_frame_idx = min(frame_idx + sample_interval, total_frames)
-                end_timestamp_ms = round((next_frame_idx / fps) * 1000)
-
-                frame_data: Dict[str, Union[np.ndarray, int, float, Tuple[int, int]]] = {
-                    'frame': processed_frame,
-                    'timestamp_ms': timestamp_ms,
-                    'end_timestamp_ms': end_timestamp_ms,
-                    'frame_idx': frame_idx,
-                    'scale_factor': scale_factor,  
-                    'original_size': original_size  
-                }
-                
-                yield frame_data, fps, total_frames
-                del frame
+                self._decode_buffer = frame
+                yield self._sample_frame(frame, frame_idx, sample_interval, timestamps_ms)
         
         except Exception as e:
             logger.error(f"Error in frame extraction: {e}")
@@ -347,26 +635,90 @@ class FrameProcessor:
             if cap is not None:
                 cap.release()
 
-    def _preprocess_frame(self, frame: np.ndarray) -> Tuple[np.ndarray, float, Tuple[int, int]]:
-        """Resize frame for optimal processing with better scaling."""
+    def _sample_frame(
+        self,
+        frame: np.ndarray,
+        frame_idx: int,
+        sample_interval: int,
+        timestamps_ms: np.ndarray,
+        original_size: Optional[Tuple[int, int]] = None
+    ) -> SampledFrame:
+        """Preprocess a sampled frame and attach its precomputed time span."""
+        processed_frame, scale_factor, original_size = self._preprocess_frame(frame, original_size)
+        sample = frame_idx // sample_interval
+
+        return SampledFrame(
+            frame=processed_frame,
+            frame_idx=frame_idx,
+            timestamp_ms=int(timestamps_ms[sample]),
+            end_timestamp_ms=int(timestamps_ms[sample + 1]),
+            scale_factor=scale_factor,
+            original_size=original_size
+        )
+
+    def _target_size(self, width: int, height: int) -> Optional[Tuple[int, int]]:
+        """Processing size (width, height) for a frame, or None if it needs no downscaling."""
+        if height > self.config.target_resolution_height:
+            target_h = self.config.target_resolution_height
+            return int(width * (target_h / height)), target_h
+        return None
+
+    def _preprocess_frame(
+        self,
+        frame: np.ndarray,
+        original_size: Optional[Tuple[int, int]] = None
+    ) -> Tuple[np.ndarray, float, Tuple[int, int]]:
+        """
+        Resize frame for optimal processing with better scaling.
+
+        original_size is passed when the decoder already scaled the frame, so
+        only the scale factor back to the source resolution is computed.
+        """
         if frame is None:
             raise ValueError("Received None frame")
         
+        if original_size is not None:
+            return frame, original_size[1] / frame.shape[0], original_size
+
         original_h, original_w = frame.shape[:2]
         
-        if original_h > self.config.target_resolution_height:
-            target_h = self.config.target_resolution_height
-            target_w = int(original_w * (target_h / original_h))
-            
+        target_size = self._target_size(original_w, original_h)
+        if target_size:
             resized = cv2.resize(
                 frame, 
-                (target_w, target_h), 
+                target_size, 
+                dst=self._next_buffer((target_size[1], target_size[0]) + frame.shape[2:]),
                 interpolation=cv2.INTER_LINEAR
             )
-            scale_factor = original_h / target_h  
+            scale_factor = original_h / target_size[1]  
             return resized, scale_factor, (original_w, original_h)
         
-        return frame.copy(), 1.0, (original_w, original_h)
+        # The decode buffer is reused for the next frame, so copy out of it
+        copied = self._next_buffer(frame.shape)
+        np.copyto(copied, frame)
+        return copied, 1.0, (original_w, original_h)
+
+
+def limit_native_threads(max_workers: int) -> None:
+    """
+    Share the CPU between plugin threads instead of letting every native
+    thread pool (OpenMP, MKL, OpenBLAS, torch) size itself to all cores.
+
+    The environment variables only reach libraries that have not started their
+    pools yet, and explicit user settings win; torch and OpenCV are set directly.
+    """
+    threads = max(1, (os.cpu_count() or 1) // max(1, max_workers))
+    for var in ('OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'OPENBLAS_NUM_THREADS'):
+        os.environ.setdefault(var, str(threads))
+
+    # Resizes and colour conversions are small next to the plugin work
+    # running alongside them
+    cv2.setNumThreads(1)
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
 
 
 def load_plugins(config: AnalysisConfig) -> List[AnalyzerPlugin]:
@@ -397,12 +749,11 @@ def load_plugins(config: AnalysisConfig) -> List[AnalyzerPlugin]:
             module = importlib.import_module(module_name)
             logger.info(f"  ✓ Imported {module_name}")
             
-            for name, cls in inspect.getmembers(module, inspect.isclass):
-                if name == plugin_name and issubclass(cls, AnalyzerPlugin) and cls is not AnalyzerPlugin:
-                    plugin_instance = cls(config_dict)
-                    plugins.append(plugin_instance)
-                    logger.info(f"  ✓ Initialized {name}")
-                    break
+            cls = getattr(module, plugin_name, None)
+            if inspect.isclass(cls) and issubclass(cls, AnalyzerPlugin) and cls is not AnalyzerPlugin:
+                plugin_instance = cls(config_dict)
+                plugins.append(plugin_instance)
+                logger.info(f"  ✓ Initialized {plugin_name}")
                     
         except Exception as e:
             logger.error(f"  ✗ Error with {module_name}: {e}")
@@ -412,6 +763,27 @@ def load_plugins(config: AnalysisConfig) -> List[AnalyzerPlugin]:
     logger.info(f"Total plugins loaded: {len(plugins)}\n")
     return plugins
 
+def plan_plugin_stages(plugins: List[AnalyzerPlugin]) -> List[List[AnalyzerPlugin]]:
+    """
+    Group plugins into stages whose members can run concurrently.
+
+    Each plugin goes one stage after the latest plugin it depends_on, so it
+    sees their output; dependencies that are not loaded are ignored. Plugins
+    keep their load order within a stage.
+    """
+    stage_of: Dict[str, int] = {}
+    stages: List[List[AnalyzerPlugin]] = []
+
+    for plugin in plugins:
+        stage = max((stage_of[name] + 1 for name in plugin.depends_on if name in stage_of), default=0)
+        stage_of[plugin.__class__.__name__] = stage
+        if stage == len(stages):
+            stages.append([])
+        stages[stage].append(plugin)
+
+    return stages
+
+
 class VideoAnalyzer:
     """Main video analysis coordinator with memory-optimized streaming."""
 
@@ -427,7 +799,7 @@ class VideoAnalyzer:
         self.progress_callback: Optional[
             Callable[[float, float, float, float], None]
         ] = None
-        self.start_time: Optional[float] = None
+        self.start_ns: Optional[int] = None
         self.frames_analyzed: int = 0
         self.plugin_frame_counters: Dict[str, int] = {}
         self.plugin_metrics: Dict[str, List[float]] = {}
@@ -435,8 +807,39 @@ class VideoAnalyzer:
         self.plugin_timeouts: Dict[str, int] = {}
         Path(self.config.output_dir).mkdir(parents=True, exist_ok=True)
 
+        limit_native_threads(self.config.max_workers)
         self.plugin_definitions: List[AnalyzerPlugin] = load_plugins(self.config)
         self.plugins: List[AnalyzerPlugin] = []
+        self._plugins_ready: bool = False
+        self._plugin_stages: List[List[AnalyzerPlugin]] = []
+        # Runs independent plugins side by side; their models spend most of
+        # the time in native code that releases the GIL
+        self._plugin_executor: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=self.config.max_workers, thread_name_prefix='plugin'
+        )
+
+    def reset(self, video_path: str, config: AnalysisConfig) -> None:
+        """
+        Prepare the analyzer for another video, keeping its set-up plugins.
+
+        config must match the one the plugins were built from; it replaces
+        the previous copy, which analyze() may have adjusted for memory.
+        """
+        self.video_path = video_path
+        self.config = config
+        self.video_base_name = Path(video_path).stem
+        self.metrics = []
+        self.frame_processor = FrameProcessor(config)
+        self.memory_monitor = MemoryMonitor(config)
+        self.progress_callback = None
+        self.start_ns = None
+        self.frames_analyzed = 0
+        self.plugin_frame_counters = {}
+        self.plugin_metrics = {}
+        self.plugin_errors = {}
+        self.plugin_timeouts = {}
+        for plugin in self.plugins:
+            plugin.reset()
 
     def _track_stage(self, stage_name: str) -> StageTracker:
         """Create performance tracking context manager."""
@@ -444,8 +847,8 @@ class VideoAnalyzer:
 
     def analyze(self) -> VideoAnalysisResult:
         """Execute complete video analysis pipeline."""
-        start_time = time.time()
-        self.start_time = start_time
+        start_ns = time.perf_counter_ns()
+        self.start_ns = start_ns
         
         if self.progress_callback:
             self.progress_callback(0, 0.0, 0, 0)
@@ -462,7 +865,7 @@ class VideoAnalyzer:
             with self._track_stage("post_processing"):
                 scene_analysis, activities, face_summary = self._run_post_processing(frame_analyses)
 
-            total_time = time.time() - start_time
+            total_time = (time.perf_counter_ns() - start_ns) * 1e-9
 
             if self.config.enable_performance_report:
                 self._print_performance_report(total_time)
@@ -497,7 +900,11 @@ class VideoAnalyzer:
             return self._create_error_result(str(e))
 
     def _setup_plugins(self) -> None:
-        """Initialize all plugins sequentially."""
+        """Initialize all plugins sequentially; a reused analyzer keeps its plugins."""
+        if self._plugins_ready:
+            logger.info(f"Reusing {len(self.plugins)} loaded plugins\n")
+            return
+
         if self.config.lazy_plugin_init and self.plugin_definitions:
             if isinstance(self.plugin_definitions[0], tuple):
                 logger.info("Initializing plugins sequentially...")
@@ -525,12 +932,14 @@ class VideoAnalyzer:
                 except Exception as e:
                     logger.error(f"Failed to setup {plugin.__class__.__name__}: {e}")
 
+        self._plugin_stages = plan_plugin_stages(self.plugins)
+        self._plugins_ready = True
         logger.info(f"Successfully loaded {len(self.plugins)} plugins\n")
 
     def _analyze_streaming_optimized(self) -> List[FrameAnalysis]:
         """Stream-process video frames with optimized batching."""
         frame_analyses: List[FrameAnalysis] = []
-        batch: List[Dict[str, Union[np.ndarray, int, float, Tuple[int, int]]]] = []
+        batch: List[SampledFrame] = []
         
         cap = cv2.VideoCapture(self.video_path)
         fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
@@ -547,42 +956,17 @@ class VideoAnalyzer:
                 self.config.frame_buffer_limit = 4
         
         with self._track_stage("streaming_analysis") as stage:
-            class CallbackTqdm(tqdm):
-                def __init__(self, *args: object, callback: Optional[Callable[[float, float, float, float], None]] = None, **kwargs: object):
-                    self.callback = callback
-                    self.start_time = time.time()
-                    super().__init__(*args, **kwargs)
-                
-                def update(self, n: int = 1) -> bool:
-                    result = super().update(n)
-                    if self.callback and self.total:
-                        try:
-                            elapsed = time.time() - self.start_time
-                            progress_percent = min(100.0, (self.n / self.total) * 100.0)
-                            self.callback(
-                                progress_percent,
-                                elapsed,
-                                float(self.n),
-                                float(self.total)
-                            )
-                        except Exception as e:
-                            logger.debug(f"Progress callback error: {e}")
-                    return result
-            
-            with CallbackTqdm(
-                total=total_sampled, 
-                desc="  Processing", 
-                unit="frame", 
-                file=sys.stderr,
-                callback=self.progress_callback
-            ) as pbar:
+            with ProgressReporter(total_sampled, self.progress_callback) as pbar:
                 try:
-                    frame_generator = self.frame_processor.extract_frames_streaming_generator(
-                        self.video_path
+                    # Decode the next frames on a separate thread while this
+                    # one runs the plugins on the current batch
+                    frame_generator = prefetch(
+                        self.frame_processor.extract_frames_streaming_generator(self.video_path),
+                        self.config.frame_buffer_limit
                     )
                     
-                    for frame_idx, (frame_data, fps, total_frames) in enumerate(frame_generator):
-                        batch.append(frame_data)
+                    for frame_idx, sampled_frame in enumerate(frame_generator):
+                        batch.append(sampled_frame)
                         
                         if len(batch) >= self.config.frame_buffer_limit:
                             batch_results = self._process_and_cleanup_batch(
@@ -619,9 +1003,9 @@ class VideoAnalyzer:
 
     def _process_and_cleanup_batch(
         self,
-        batch: List[Dict[str, Union[np.ndarray, int, float, Tuple[int, int]]]],
+        batch: List[SampledFrame],
         frame_idx: int,
-        pbar: tqdm,
+        pbar: ProgressReporter,
         is_final: bool = False,
     ) -> List[FrameAnalysis]:
         """Process batch and aggressively clean up memory."""
@@ -643,10 +1027,9 @@ class VideoAnalyzer:
         
         return batch_results
     
-    def _cleanup_batch_frames(self, batch: List[Dict[str, Union[np.ndarray, int, float, Tuple[int, int]]]]) -> None:
-        """Delete all frame arrays from memory."""
-        for frame_data in batch:
-            frame_data.pop('frame', None)
+    def _cleanup_batch_frames(self, batch: List[SampledFrame]) -> None:
+        """Drop the batch's references to its frame arrays."""
+        batch.clear()
             
     def _should_run_plugin(self, plugin: AnalyzerPlugin, frame_idx: int) -> bool:
         """Determine if plugin should run on this frame based on skip interval."""
@@ -667,44 +1050,130 @@ class VideoAnalyzer:
         
         return self.plugin_frame_counters[plugin_name] % skip_interval == 0
     
-    def _process_micro_batch(self, batch: List[Dict[str, Union[np.ndarray, int, float, Tuple[int, int]]]]) -> List[FrameAnalysis]:
+    def _process_micro_batch(self, batch: List[SampledFrame]) -> List[FrameAnalysis]:
         """Process batch through plugins with selective execution."""
         results: List[FrameAnalysis] = [
             {
-                'start_time_ms': b['timestamp_ms'],
-                'end_time_ms': b['end_timestamp_ms'],
-                'duration_ms': b['end_timestamp_ms'] - b['timestamp_ms'],
-                'frame_idx': b['frame_idx']
+                'start_time_ms': b.timestamp_ms,
+                'end_time_ms': b.end_timestamp_ms,
+                'duration_ms': b.end_timestamp_ms - b.timestamp_ms,
+                'frame_idx': b.frame_idx
             }
             for b in batch
         ]
         
-        for plugin in self.plugins:
-            plugin_name = plugin.__class__.__name__
+        for stage in self._plugin_stages:
+            # Frame selection updates the skip counters, so it stays on this thread
+            selections = [(plugin, self._select_frames(plugin, batch)) for plugin in stage]
+            selections = [(plugin, selected) for plugin, selected in selections if selected]
+
+            if len(selections) > 1:
+                futures = [
+                    self._plugin_executor.submit(self._run_plugin, plugin, batch, selected, results)
+                    for plugin, selected in selections
+                ]
+                stage_outputs = [future.result() for future in futures]
+            else:
+                stage_outputs = [
+                    self._run_plugin(plugin, batch, selected, results) for plugin, selected in selections
+                ]
+
+            # Merge in plugin order once the whole stage is done, so plugins in
+            # one stage all see the same input
+            for plugin_outputs in stage_outputs:
+                for i, plugin_result in plugin_outputs:
+                    results[i].update(plugin_result)
+
+        return results
+
+    def _select_frames(
+        self, plugin: AnalyzerPlugin, batch: List[SampledFrame]
+    ) -> List[int]:
+        """Indices of the batch frames this plugin should analyze."""
+        plugin_name = plugin.__class__.__name__
+        selected: List[int] = []
+
+        for i in range(len(batch)):
+            frame_idx = batch[i].frame_idx
             
-            for i in range(len(batch)):
-                frame_idx = batch[i]['frame_idx']
-                
-                if not self._should_run_plugin(plugin, frame_idx):
-                    logger.debug(f"Skipping {plugin_name} for frame {frame_idx}")
-                    continue
-                
-                try:
-                    plugin_result = self._safe_plugin_call(
-                        plugin,
-                        batch[i]['frame'],
-                        results[i].copy(),
-                    )
+            if not self._should_run_plugin(plugin, frame_idx):
+                logger.debug(f"Skipping {plugin_name} for frame {frame_idx}")
+                continue
+            selected.append(i)
+
+        return selected
+
+    def _run_plugin(
+        self,
+        plugin: AnalyzerPlugin,
+        batch: List[SampledFrame],
+        selected: List[int],
+        results: List[FrameAnalysis],
+    ) -> List[Tuple[int, FrameAnalysis]]:
+        """
+        Run one plugin over the selected frames without touching results.
+
+        Returns:
+            List of (batch index, updated frame analysis) pairs
+        """
+        plugin_name = plugin.__class__.__name__
+        outputs: List[Tuple[int, FrameAnalysis]] = []
+
+        # Plugins with a batched model get every selected frame in one call;
+        # if that fails, retry frame by frame so one bad frame loses only itself
+        if len(selected) > 1 and type(plugin).analyze_batch is not AnalyzerPlugin.analyze_batch:
+            batch_results = self._safe_plugin_batch_call(
+                plugin,
+                [batch[i].frame for i in selected],
+                [results[i].copy() for i in selected],
+            )
+            if batch_results is not None:
+                for i, plugin_result in zip(selected, batch_results):
                     if plugin_result and isinstance(plugin_result, dict):
-                        results[i].update(plugin_result)
-                        
-                except TimeoutError:
-                    logger.warning(
-                        f"Timeout: Frame {i} in {plugin_name} took too long"
-                    )
-                except Exception as e:
-                    logger.warning(f"Frame {i} failed in {plugin.__class__.__name__}: {e}")
+                        outputs.append((i, plugin_result))
+                return outputs
+
+        for i in selected:
+            try:
+                plugin_result = self._safe_plugin_call(
+                    plugin,
+                    batch[i].frame,
+                    results[i].copy(),
+                )
+                if plugin_result and isinstance(plugin_result, dict):
+                    outputs.append((i, plugin_result))
+                    
+            except TimeoutError:
+                logger.warning(
+                    f"Timeout: Frame {i} in {plugin_name} took too long"
+                )
+            except Exception as e:
+                logger.warning(f"Frame {i} failed in {plugin_name}: {e}")
+
+        return outputs
+
+    def _safe_plugin_batch_call(
+        self, plugin: AnalyzerPlugin, frames: List[np.ndarray], frame_analyses: List[FrameAnalysis]
+    ) -> Optional[List[FrameAnalysis]]:
+        """Call a plugin's batched path; returns None if it failed."""
+        plugin_name = plugin.__class__.__name__
+
+        if plugin_name not in self.plugin_metrics:
+            self.plugin_metrics[plugin_name] = []
+            self.plugin_errors[plugin_name] = 0
+            self.plugin_timeouts[plugin_name] = 0
 
+        start_ns = time.perf_counter_ns()
+
+        try:
+            results = plugin.analyze_batch(frames, frame_analyses, self.video_path)
+        except Exception as e:
+            logger.warning(f"Batch error in {plugin_name}, retrying per frame: {e}")
+            return None
+
+        # Record the per-frame share so timings stay comparable with single calls
+        duration_ms = (time.perf_counter_ns() - start_ns) * 1e-6 / len(frames)
+        self.plugin_metrics[plugin_name].extend([duration_ms] * len(frames))
         return results
 
     def _safe_plugin_call(
@@ -718,15 +1187,15 @@ class VideoAnalyzer:
             self.plugin_errors[plugin_name] = 0
             self.plugin_timeouts[plugin_name] = 0
         
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         
         try:
             result = plugin.analyze_frame(frame, frame_analysis, self.video_path)
-            duration_ms = (time.time() - start_time) * 1000
+            duration_ms = (time.perf_counter_ns() - start_ns) * 1e-6
             self.plugin_metrics[plugin_name].append(duration_ms)
             return result
         except Exception as e:
-            duration_ms = (time.time() - start_time) * 1000
+            duration_ms = (time.perf_counter_ns() - start_ns) * 1e-6
             self.plugin_timeouts[plugin_name] += 1
             logger.warning(f"Error in {plugin.__class__.__name__}: {e}")
             return frame_analysis
@@ -869,6 +1338,22 @@ class VideoAnalyzer:
         )
 
 
+def _numpy_default(obj: object) -> Union[List, int, float, bool]:
+    """Convert NumPy arrays and scalars that json cannot serialize."""
+    if isinstance(obj, (np.ndarray, np.generic)):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _encode_json(value: object) -> bytes:
+    """Encode a value as compact UTF-8 JSON."""
+    if HAS_ORJSON:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(
+        value, separators=(",", ":"), ensure_ascii=False, default=_numpy_default
+    ).encode('utf-8')
+
+
 class OutputManager:
     """Manages analysis result serialization."""
     
@@ -878,14 +1363,44 @@ class OutputManager:
         video_name = Path(video_path).stem
         return Path(output_dir) / f"{video_name}_analysis.json"
     
+    @staticmethod
+    def write_result(result: "VideoAnalysisResult", f: BinaryIO) -> None:
+        """
+        Stream an analysis result to a binary file as compact UTF-8 JSON.
+
+        frame_analysis is written one entry at a time, so the encoded form of
+        the whole result is never held in memory at once. The file is compact
+        because the service forwards its bytes as-is as the result payload.
+        """
+        f.write(b"{")
+        for i, field in enumerate(fields(result)):
+            value = getattr(result, field.name)
+            f.write((b"," if i else b"") + _encode_json(field.name) + b":")
+
+            if field.name == 'frame_analysis':
+                f.write(b"[")
+                for j, frame_analysis in enumerate(value):
+                    f.write((b"," if j else b"") + _encode_json(frame_analysis))
+                f.write(b"]")
+            else:
+                f.write(_encode_json(value))
+        f.write(b"}")
+
+    @staticmethod
+    def encode_result(result: "VideoAnalysisResult") -> bytes:
+        """Serialize an analysis result in memory, in the same format as write_result."""
+        buffer = io.BytesIO()
+        OutputManager.write_result(result, buffer)
+        return buffer.getvalue()
+
     @staticmethod
     def save_result(result: "VideoAnalysisResult", output_path: "Path") -> bool:
-        """Save analysis result to JSON file."""
+        """Stream analysis result to JSON file."""
         try:
             output_path.parent.mkdir(parents=True, exist_ok=True)
             
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(result.to_dict(), f, indent=2, ensure_ascii=False)
+            with open(output_path, 'wb') as f:
+                OutputManager.write_result(result, f)
             
             logger.info(f"\n✓ Results saved to: {output_path}")
             return True
@@ -902,6 +1417,84 @@ class OutputManager:
         print(str(output_path.absolute()))
 
 
+class AnalyzerPool:
+    """
+    Keeps analyzers between runs so their plugin models are loaded only once.
+
+    Analyzers are keyed by their configuration and only reused for an equal
+    one. A worker process runs one analysis at a time, so by default a single
+    idle analyzer is kept.
+    """
+
+    def __init__(self, max_idle: int = 1) -> None:
+        self.max_idle: int = max_idle
+        self._lock: threading.Lock = threading.Lock()
+        # Idle analyzers by config key, least recently released first
+        self._idle: List[Tuple[str, VideoAnalyzer]] = []
+
+    @staticmethod
+    def config_key(config: AnalysisConfig) -> str:
+        """Identify the models and settings an analyzer was built with."""
+        return repr(asdict(config))
+
+    def _take_idle(self, key: str) -> Optional[VideoAnalyzer]:
+        with self._lock:
+            for i, (idle_key, analyzer) in enumerate(self._idle):
+                if idle_key == key:
+                    del self._idle[i]
+                    return analyzer
+        return None
+
+    def _release(self, key: str, analyzer: VideoAnalyzer) -> None:
+        analyzer.progress_callback = None
+        with self._lock:
+            self._idle.append((key, analyzer))
+            while len(self._idle) > self.max_idle:
+                self._idle.pop(0)
+
+    @contextlib.contextmanager
+    def checkout(self, video_path: str, config: AnalysisConfig) -> Iterator[VideoAnalyzer]:
+        """
+        Lend an analyzer for video_path, reusing an idle one built for an equal config.
+
+        The analyzer goes back to the pool afterwards unless analysis raised.
+        """
+        key = self.config_key(config)
+        analyzer = self._take_idle(key)
+        if analyzer is not None:
+            try:
+                analyzer.reset(video_path, config)
+            except Exception as e:
+                logger.warning(f"Discarding pooled analyzer that failed to reset: {e}")
+                analyzer = None
+        if analyzer is None:
+            analyzer = VideoAnalyzer(video_path, config)
+
+        yield analyzer
+        self._release(key, analyzer)
+
+
+_analyzer_pool = AnalyzerPool()
+
+
+def run_analysis(
+    video_path: str,
+    config: AnalysisConfig,
+    progress_queue: Optional["queue.Queue[Tuple[float, float, float, float]]"] = None
+) -> VideoAnalysisResult:
+    """
+    Analyze a video; picklable entry point for running in a worker process.
+
+    Progress ticks are put on progress_queue as
+    (progress, elapsed, frames_analyzed, total_frames) tuples. The worker
+    keeps its analyzer, with plugin models loaded, for the next job.
+    """
+    with _analyzer_pool.checkout(video_path, config) as analyzer:
+        if progress_queue is not None:
+            analyzer.progress_callback = lambda *progress: progress_queue.put(progress)
+        return analyzer.analyze()
+
+
 def analyze_and_save(video_path: str, output_path: Path, config: AnalysisConfig) -> None:
     """Analyze video and save results to JSON."""
     try:
@@ -3,13 +3,18 @@ import os
 import json
 import asyncio
 from pathlib import Path
-from typing import Optional, Callable, List, Dict, Union
+from typing import Optional, Callable, List, Dict, Tuple, Union
 import time 
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# How many requests the add_face.py worker may have queued ahead of the response being read
+MAX_PENDING_REQUESTS = 4
+
+ADD_FACE_SCRIPT = str(Path(__file__).parent / "add_face.py")
+
 async def create_faces_data_from_folder_async():
     """
     Asynchronously scans the specified faces directory, expecting subfolders named after individuals,
@@ -110,74 +115,117 @@ async def batch_add_faces_from_folder(
                 'image_path': image_path
             })
 
-    script_dir = Path(__file__).parent
-    add_face_script = script_dir / "add_face.py"
-    
     project_root = Path(os.getcwd())
     
     total_images = len(images_to_process)
-    processed_images = 0
-
     if total_images == 0:
         await report_progress("No images found to process.", current=0, total=0)
         return True
 
+    # One long-running add_face.py worker pays the dlib/model import cost once for the whole batch;
+    # --gpu-if-available moves detection to dlib's CUDA CNN detector when a GPU is present and
+    # quietly stays on the CPU otherwise, without importing dlib here just to check
+    process = await asyncio.create_subprocess_exec(
+        sys.executable,
+        ADD_FACE_SCRIPT,
+        "--server",
+        "--gpu-if-available",
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE
+    )
+
+    # Group images per person so each person is encoded and appended in one request
+    images_by_name: Dict[str, List[str]] = {}
     for image_info in images_to_process:
-        name = image_info['name']
-        image_path_relative = image_info['image_path']
-        
-        processed_images += 1
-        
-        message_prefix = f"Processing image: {image_path_relative} (person: {name})"
-        await report_progress(message_prefix, processed_images, total_images)
-        
-        # Handle both relative and absolute paths
-        if os.path.isabs(image_path_relative):
-            absolute_image_path = Path(image_path_relative)
-        else:
-            absolute_image_path = project_root / image_path_relative
-        
-        if not absolute_image_path.exists():
-            warning_msg = f"Image not found at {absolute_image_path}. Skipping."
-            await report_progress(warning_msg, processed_images, total_images)
-            continue
-
-        command = [
-            sys.executable,
-            str(add_face_script),
-            name,
-            str(absolute_image_path),
-            str(project_root / known_faces_file)
-        ]
-        process = await asyncio.create_subprocess_exec(
-            *command,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
-        )
-        
-        stdout_data = await process.communicate()
-        return_code = process.returncode 
-        
-        stdout_str = stdout_data.decode().strip()
-        if return_code == 0:
+        images_by_name.setdefault(image_info['name'], []).append(image_info['image_path'])
+
+    # Requests written to the worker whose responses have not been read yet, as
+    # (name, image count, processed image count). Bounded so the writer only runs a few people
+    # ahead, keeping the worker busy while responses are handled here.
+    pending: "asyncio.Queue[Optional[Tuple[str, int, int]]]" = asyncio.Queue(maxsize=MAX_PENDING_REQUESTS)
+
+    async def write_requests() -> None:
+        processed = 0
+        for name, image_paths_relative in images_by_name.items():
+            absolute_image_paths = []
+            for image_path_relative in image_paths_relative:
+                # Handle both relative and absolute paths
+                if os.path.isabs(image_path_relative):
+                    absolute_image_path = Path(image_path_relative)
+                else:
+                    absolute_image_path = project_root / image_path_relative
+
+                if not absolute_image_path.exists():
+                    warning_msg = f"Image not found at {absolute_image_path}. Skipping."
+                    await report_progress(warning_msg, processed, total_images)
+                    continue
+                absolute_image_paths.append(str(absolute_image_path))
+
+            processed += len(image_paths_relative)
+            if not absolute_image_paths:
+                continue
+
+            await pending.put((name, len(image_paths_relative), processed))
+            request = {
+                "name": name,
+                "image_paths": absolute_image_paths,
+                "known_faces_file": str(project_root / known_faces_file)
+            }
+            try:
+                process.stdin.write((json.dumps(request) + "\n").encode())
+                await process.stdin.drain()
+            except (BrokenPipeError, ConnectionResetError):
+                # Worker died; reading the response just queued reports it
+                return
+        await pending.put(None)
+
+    writer = asyncio.create_task(write_requests())
+    finished = False
+    try:
+        while True:
+            item = await pending.get()
+            if item is None:
+                break
+            name, image_count, processed_images = item
+            message_prefix = f"Processing {image_count} image(s) (person: {name})"
+            await report_progress(message_prefix, processed_images - image_count, total_images)
+
+            response_line = await process.stdout.readline()
+            if not response_line:
+                error_msg = f"add_face.py worker exited while processing images for {name}. Return code: {await process.wait()}"
+                print(error_msg, file=sys.stderr)
+                await report_progress(error_msg, processed_images, total_images)
+                return False
+
+            response_str = response_line.decode().strip()
+            try:
+                json_output = json.loads(response_str)
+            except json.JSONDecodeError:
+                json_output = {"status": "success", "message": f"non-JSON output: {response_str[:50]}..."}
+
+            if json_output.get("status") == "error":
+                error_msg = f"add_face.py failed for {name}: {json_output.get('message', 'Unknown error')}"
+                print(error_msg, file=sys.stderr)
+                await report_progress(error_msg, processed_images, total_images)
+                return False
+
             status_message = "Success"
-            if stdout_str:
-                try:
-                    print(stdout_str)
-                    json_output = json.loads(stdout_str)
-                    if json_output.get("status") == "warning":
-                        status_message = f"Warning: {json_output.get('message', 'Multiple faces found.')}"
-                    elif json_output.get("status") == "error":
-                        status_message = f"Error (despite code 0): {json_output.get('message', 'Unknown error')}"
-                except json.JSONDecodeError:
-                    status_message = f"Success (non-JSON output: {stdout_str[:50]}...)"
-            
+            if json_output.get("status") == "warning":
+                status_message = f"Warning: {json_output.get('message', 'Some images were skipped.')}"
+                for skipped in json_output.get("skipped", []):
+                    print(f"Skipped {skipped.get('image_path')}: {skipped.get('message')}", file=sys.stderr)
+
             await report_progress(status_message, processed_images, total_images)
-        else:
-            error_msg = f"add_face.py failed for {image_path_relative}. Return code: {process.returncode}"
-            print(error_msg, file=sys.stderr)
-            await report_progress(error_msg, processed_images, total_images)
-            return False
+        finished = True
+    finally:
+        writer.cancel()
+        if process.returncode is None:
+            if not finished:
+                # Requests already written for later people must not be applied after a failure
+                process.kill()
+            else:
+                process.stdin.close()
+            await process.wait()
 
     await report_progress("All faces processed.", total_images, total_images)
     return True
\ No newline at end of file
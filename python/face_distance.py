@@ -0,0 +1,59 @@
+"""
+Euclidean distance between a query face encoding and the known encodings matrix.
+
+With numba installed the compare runs as a compiled, parallel kernel over the
+float32 matrix loaded from the face store; otherwise it falls back to NumPy.
+"""
+import logging
+
+import numpy as np
+
+from face_store import ENCODING_DTYPE, ENCODING_SIZE
+
+logger = logging.getLogger(__name__)
+
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+    logger.debug("numba not installed. Using NumPy face distances.")
+
+
+if HAS_NUMBA:
+    # cache=True keeps the compiled kernel on disk so only the first run pays for compilation.
+    # No eager signature: the known matrix is usually a read-only memmap from the
+    # face store, which numba types separately from a writable array.
+    @njit(fastmath=True, parallel=True, cache=True)
+    def _squared_distances(known, query):
+        out = np.empty(known.shape[0], dtype=np.float32)
+        for i in prange(known.shape[0]):
+            acc = np.float32(0.0)
+            for j in range(known.shape[1]):
+                diff = known[i, j] - query[j]
+                acc += diff * diff
+            out[i] = acc
+        return out
+else:
+    def _squared_distances(known: np.ndarray, query: np.ndarray) -> np.ndarray:
+        diff = known - query
+        return np.einsum('ij,ij->i', diff, diff)
+
+
+def face_distances(known_encodings: np.ndarray, face_encoding: np.ndarray) -> np.ndarray:
+    """
+    Compute the distance from one encoding to every known encoding.
+
+    Args:
+        known_encodings: (N, 128) encodings matrix
+        face_encoding: 128-D encoding to compare
+
+    Returns:
+        (N,) array of Euclidean distances, same as face_recognition.face_distance
+    """
+    if len(known_encodings) == 0:
+        return np.empty(0, dtype=ENCODING_DTYPE)
+
+    known = np.ascontiguousarray(known_encodings, dtype=ENCODING_DTYPE).reshape(-1, ENCODING_SIZE)
+    query = np.ascontiguousarray(face_encoding, dtype=ENCODING_DTYPE).reshape(ENCODING_SIZE)
+    return np.sqrt(_squared_distances(known, query))
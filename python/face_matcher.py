@@ -1,6 +1,7 @@
 import os
 import sys
 import json
+import asyncio
 import face_recognition
 import numpy as np
 from typing import List, Dict, Optional, Callable, TypedDict, Union
@@ -151,7 +152,7 @@ class FaceMatcher:
                         face_data=face_data
                     ))
                     logger.info(f"Face match found: {image_file} (confidence: {confidence:.2%})")
-                    face_id = self.get_face_id_from_json(json_file, unknown_faces_dir)
+                    face_id = face_data.get('image_hash')
                     elapsed = time.monotonic() - start_time
                     progress_percent = (idx / total_files) * 100
                     if progress_callback:
@@ -208,8 +209,6 @@ async def find_and_label_matching_faces(
     Returns:
         Dictionary with matching faces information
     """
-    import asyncio
-    
     matcher = FaceMatcher(tolerance=tolerance)
     
     # Load reference encodings
@@ -240,12 +239,11 @@ async def find_and_label_matching_faces(
     
     match_data = []
     for match in matches:
-        face_id = matcher.get_face_id_from_json(match.json_file, unknown_faces_dir)
         match_data.append({
             "json_file": match.json_file,
             "image_file": match.image_file,
             "confidence": match.confidence,
-            "face_id": face_id,
+            "face_id": match.face_data.get('image_hash'),
             "face_data": match.face_data
         })
     
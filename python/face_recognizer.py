@@ -1,11 +1,13 @@
 import face_recognition
 import numpy as np
-import json
 from collections import defaultdict
 import os
-from typing import List, Dict
+from typing import List, Dict, Optional
 from dotenv import load_dotenv
 
+from face_distance import face_distances
+from face_store import ENCODING_SIZE, load_known_faces, write_known_faces
+
 load_dotenv()
 class FaceRecognizer:
     def __init__(self, known_faces_file: str ='.faces.json', tolerance: float =0.40, model: str ='cnn'):
@@ -22,6 +24,7 @@ class FaceRecognizer:
         self.model = model
         self.known_face_encodings: List[np.ndarray] = []
         self.known_face_names: List[str] = []
+        self._known_encodings_matrix: Optional[np.ndarray] = None
         self.unknown_face_encodings: Dict[str, List[np.ndarray]] = defaultdict(list)
         self.unknown_face_counter = 0
         self.load_known_faces()
@@ -29,72 +32,28 @@ class FaceRecognizer:
 
                 
     def load_known_faces(self):
-        """Load known faces from JSON ensuring float arrays."""
+        """Load known faces from the store as rows of the float32 encodings matrix."""
         self.known_face_encodings = []
         self.known_face_names = []
+        self._known_encodings_matrix = None
 
         try:
-            with open(self.known_faces_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            names, encodings = load_known_faces(self.known_faces_file)
         except FileNotFoundError:
             # File doesn't exist yet, start with empty lists
             return
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Invalid JSON in {self.known_faces_file}: {e}")
 
-        if isinstance(data, dict):
-            for name, enc_list in data.items():
-                # Skip if enc_list is not a list
-                if not isinstance(enc_list, list):
-                    continue
-                    
-                for enc in enc_list:
-                    # Skip if enc is not a list/array (e.g., if it's a string path)
-                    if not isinstance(enc, (list, np.ndarray)):
-                        continue
-                    
-                    # Skip if enc is empty or doesn't look like an encoding (should be 128 floats)
-                    if not enc or len(enc) != 128:
-                        continue
-                    
-                    try:
-                        # Ensure numeric array
-                        encoding_array = np.array(enc, dtype=np.float64)
-                        self.known_face_encodings.append(encoding_array)
-                        self.known_face_names.append(name)
-                    except (ValueError, TypeError) as e:
-                        # Skip invalid encodings
-                        print(f"Warning: Skipping invalid encoding for {name}: {e}")
-                        continue
+        self.known_face_encodings = list(encodings)
+        self.known_face_names = names
+        self._known_encodings_matrix = encodings
 
-        elif isinstance(data, list):
-            for entry in data:
-                if not isinstance(entry, dict):
-                    continue
-                    
-                name = entry.get("name")
-                enc = entry.get("encoding") or entry.get("encodings")
-                
-                if not name or not enc:
-                    continue
-                
-                # Handle multiple encodings per person
-                if isinstance(enc[0], list):
-                    for e in enc:
-                        if len(e) != 128:
-                            continue
-                        try:
-                            self.known_face_encodings.append(np.array(e, dtype=np.float64))
-                            self.known_face_names.append(name)
-                        except (ValueError, TypeError):
-                            continue
-                else:
-                    if len(enc) == 128:
-                        try:
-                            self.known_face_encodings.append(np.array(enc, dtype=np.float64))
-                            self.known_face_names.append(name)
-                        except (ValueError, TypeError):
-                            continue
+    def _known_matrix(self) -> np.ndarray:
+        """Known encodings as one (N, 128) float32 matrix, rebuilt only after changes."""
+        if self._known_encodings_matrix is None:
+            self._known_encodings_matrix = np.array(
+                self.known_face_encodings, dtype=np.float32
+            ).reshape(-1, ENCODING_SIZE)
+        return self._known_encodings_matrix
 
 
     def recognize_faces(self, frame: np.ndarray, upsample: int =1) -> List[Dict[str, str]]:
@@ -137,14 +96,11 @@ class FaceRecognizer:
 
             if len(self.known_face_encodings) > 0:
                 # Calculate distances to all known faces
-                face_distances = face_recognition.face_distance(
-                    self.known_face_encodings, 
-                    face_encoding,
-                )
+                distances = face_distances(self._known_matrix(), face_encoding)
                 
                 # Find best match
-                best_match_index = np.argmin(face_distances)
-                best_distance = face_distances[best_match_index]
+                best_match_index = np.argmin(distances)
+                best_distance = float(distances[best_match_index])
                 
                 
                 # Check if match is within tolerance
@@ -185,17 +141,15 @@ class FaceRecognizer:
         """Add a known face encoding."""
         self.known_face_encodings.append(np.array(encoding))
         self.known_face_names.append(name)
+        self._known_encodings_matrix = None
 
     def save_known_faces(self) -> None:
-        """Save known faces to JSON file."""
-        known_faces_data: Dict[str, List[List[float]]] = {}
-        for name, encoding in zip(self.known_face_names, self.known_face_encodings):
-            if name not in known_faces_data:
-                known_faces_data[name] = []
-            known_faces_data[name].append(encoding.tolist())
-        
-        with open(self.known_faces_file, 'w') as f:
-            json.dump(known_faces_data, f, indent=2)
+        """Save known faces to the store."""
+        write_known_faces(
+            self.known_faces_file,
+            self.known_face_names,
+            np.array(self.known_face_encodings).reshape(-1, ENCODING_SIZE)
+        )
 
     def get_all_faces(self) -> List[Dict[str, str]]:
         """
@@ -258,6 +212,7 @@ class FaceRecognizer:
         # Clean up marked for deletion
         self.known_face_encodings = [e for e in self.known_face_encodings if e is not None]
         self.known_face_names = [n for n in self.known_face_names if n is not None]
+        self._known_encodings_matrix = None
 
         # Add merged encodings under the new name
         for encoding in merged_encodings:
@@ -0,0 +1,257 @@
+"""
+Append-only store for known face encodings.
+
+Names live in a JSON Lines file (one {"name", "row"} object per line) and
+the 128-D encodings live in a packed float32 sidecar (`<file>.f32`) that is
+memory-mapped on load, so no float parsing is needed to get a ready matrix.
+"""
+import json
+import os
+from typing import Any, Dict, Iterator, List, Tuple, Union
+
+import numpy as np
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+ENCODING_SIZE = 128
+ENCODING_DTYPE = np.float32
+ROW_BYTES = ENCODING_SIZE * np.dtype(ENCODING_DTYPE).itemsize
+
+FaceRecord = Dict[str, Union[str, int, List[float]]]
+LegacyFaces = Union[List[Dict[str, object]], Dict[str, List[List[float]]]]
+
+
+def _loads(data: str) -> Any:
+    """Parse JSON with orjson when available; legacy stores hold thousands of floats."""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dumps(obj: Any) -> str:
+    if HAS_ORJSON:
+        return orjson.dumps(obj).decode('utf-8')
+    return json.dumps(obj)
+
+
+def encodings_path(path: str) -> str:
+    """Path of the float32 sidecar holding the encodings for a store."""
+    return path + ".f32"
+
+
+def _iter_records(data: Union[LegacyFaces, FaceRecord]) -> Iterator[FaceRecord]:
+    """
+    Normalize any supported layout into store records.
+
+    Understands a single JSONL record ({"name", "row"} or the older inline
+    {"name", "encoding"}), the legacy list of records (with "encoding" or
+    "encodings") and the legacy name -> encodings mapping.
+    """
+    if isinstance(data, dict) and "name" in data and "row" in data:
+        yield data
+        return
+
+    if isinstance(data, dict) and "name" in data and ("encoding" in data or "encodings" in data):
+        data = [data]
+
+    if isinstance(data, dict):
+        for name, enc_list in data.items():
+            if not isinstance(enc_list, list):
+                continue
+            for enc in enc_list:
+                # Skip string paths and anything that doesn't look like a 128-D encoding
+                if isinstance(enc, list) and len(enc) == ENCODING_SIZE:
+                    yield {"name": name, "encoding": enc}
+
+    elif isinstance(data, list):
+        for entry in data:
+            if not isinstance(entry, dict):
+                continue
+
+            name = entry.get("name")
+            enc = entry.get("encoding") or entry.get("encodings")
+            if not name or not enc:
+                continue
+
+            # Handle multiple encodings per person
+            encodings = enc if isinstance(enc[0], list) else [enc]
+            for e in encodings:
+                if len(e) == ENCODING_SIZE:
+                    yield {"name": name, "encoding": e}
+
+
+def _is_legacy_header(line: str) -> bool:
+    """Legacy files are a single JSON document: a list, or a pretty-printed mapping."""
+    return line.startswith("[") or line == "{"
+
+
+def load_face_records(path: str) -> List[FaceRecord]:
+    """
+    Read all face records from the names file, one JSON object per line.
+
+    Legacy single-document JSON files are still understood so existing
+    stores keep loading until they are migrated.
+
+    Raises:
+        FileNotFoundError: If the store does not exist yet
+        ValueError: If a line (or the legacy document) is not valid JSON
+    """
+    records: List[FaceRecord] = []
+    first_line = True
+
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_no, line in enumerate(iter(f.readline, ''), 1):
+            line = line.strip()
+            if not line:
+                continue
+
+            if first_line and _is_legacy_header(line):
+                f.seek(0)
+                try:
+                    return list(_iter_records(_loads(f.read())))
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"Invalid JSON in {path}: {e}")
+            first_line = False
+
+            try:
+                records.extend(_iter_records(_loads(line)))
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid JSON on line {line_no} of {path}: {e.msg}")
+
+    return records
+
+
+def _map_encodings(path: str) -> np.ndarray:
+    """Memory-map the float32 sidecar as an (N, 128) matrix."""
+    try:
+        rows = os.path.getsize(encodings_path(path)) // ROW_BYTES
+    except FileNotFoundError:
+        rows = 0
+
+    if rows == 0:
+        return np.empty((0, ENCODING_SIZE), dtype=ENCODING_DTYPE)
+
+    return np.memmap(
+        encodings_path(path), dtype=ENCODING_DTYPE, mode='r', shape=(rows, ENCODING_SIZE)
+    )
+
+
+def load_known_faces(path: str) -> Tuple[List[str], np.ndarray]:
+    """
+    Load names and their encodings matrix from the store.
+
+    Returns:
+        Tuple of (names, (N, 128) float32 encodings) in matching order
+
+    Raises:
+        FileNotFoundError: If the store does not exist yet
+        ValueError: If the names file is not valid JSON
+    """
+    records = load_face_records(path)
+
+    if any("row" not in record for record in records):
+        # Legacy store with inline float lists
+        names = [str(record["name"]) for record in records]
+        encodings = np.array([record["encoding"] for record in records], dtype=ENCODING_DTYPE)
+        return names, encodings.reshape(-1, ENCODING_SIZE)
+
+    matrix = _map_encodings(path)
+    names = []
+    rows: List[int] = []
+    for record in records:
+        row = record["row"]
+        # Skip names whose encoding row is missing from the sidecar
+        if isinstance(row, int) and 0 <= row < len(matrix):
+            names.append(str(record["name"]))
+            rows.append(row)
+
+    if rows == list(range(len(matrix))):
+        return names, matrix
+    return names, np.asarray(matrix[rows])
+
+
+def is_legacy_file(path: str) -> bool:
+    """Check whether the store still keeps encodings inline as JSON floats."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in iter(f.readline, ''):
+                line = line.strip()
+                if line:
+                    return _is_legacy_header(line) or "row" not in _loads(line)
+    except (FileNotFoundError, json.JSONDecodeError):
+        pass
+    return False
+
+
+def _replace_file(path: str, data: bytes) -> None:
+    """Atomically replace a file with data via a synced temporary file."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _append_file(f, data: bytes) -> None:
+    """Append data with a single write and flush it to disk."""
+    f.write(data)
+    f.flush()
+    if hasattr(os, "fdatasync"):
+        os.fdatasync(f.fileno())
+    else:
+        os.fsync(f.fileno())
+
+
+def write_known_faces(path: str, names: List[str], encodings: np.ndarray) -> None:
+    """Rewrite the whole store with the given names and encodings."""
+    encodings = np.ascontiguousarray(encodings, dtype=ENCODING_DTYPE).reshape(-1, ENCODING_SIZE)
+
+    # Replace rather than truncate: readers may still hold a memmap of the
+    # sidecar, and a crash mid-write must not leave a half-written store
+    _replace_file(encodings_path(path), encodings.tobytes())
+    _replace_file(path, "".join(
+        _dumps({"name": name, "row": row}) + "\n" for row, name in enumerate(names)
+    ).encode('utf-8'))
+
+
+def append_known_faces(path: str, names: List[str], encodings: np.ndarray) -> None:
+    """
+    Append encodings to the store without reading or rewriting existing entries.
+
+    Encodings are written and synced first and each name records the sidecar
+    row it points to, so an interrupted append leaves at worst an unreferenced row.
+    """
+    migrate_legacy_file(path)
+    encodings = np.ascontiguousarray(encodings, dtype=ENCODING_DTYPE).reshape(-1, ENCODING_SIZE)
+
+    with open(encodings_path(path), 'ab') as f:
+        # Drop any partially written row left by an interrupted append
+        first_row = f.tell() // ROW_BYTES
+        f.truncate(first_row * ROW_BYTES)
+        _append_file(f, encodings.tobytes())
+
+    with open(path, 'ab') as f:
+        _append_file(f, "".join(
+            _dumps({"name": name, "row": first_row + i}) + "\n"
+            for i, name in enumerate(names)
+        ).encode('utf-8'))
+
+
+def migrate_legacy_file(path: str) -> bool:
+    """
+    One-shot conversion of a legacy store (single JSON document, or JSONL with
+    inline float lists) into the names file + float32 sidecar layout.
+
+    Returns:
+        True if the file was migrated, False if it was already migrated or missing
+    """
+    if not is_legacy_file(path):
+        return False
+
+    write_known_faces(path, *load_known_faces(path))
+    return True
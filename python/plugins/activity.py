@@ -18,6 +18,8 @@ class Activity:
 
 
 class ActivityPlugin(AnalyzerPlugin):
+    depends_on = ("ObjectDetectionPlugin",)
+
     def __init__(self, config: Dict[str, str]):
         super().__init__(config)
         self.captions: List[str] = []
@@ -32,6 +34,11 @@ class ActivityPlugin(AnalyzerPlugin):
             "Salesforce/blip-image-captioning-base"
         )
 
+    def reset(self) -> None:
+        self.captions = []
+        self.frame_objects = []
+        self.activities = []
+
     def analyze_frame(self, frame: np.ndarray, frame_analysis: FrameAnalysis, video_path: str) -> FrameAnalysis:
         image = Image.fromarray(frame)
 
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Union, List
+from typing import Dict, Union, List, Tuple
 import numpy as np
 
 
@@ -15,6 +15,10 @@ class AnalyzerPlugin(ABC):
     and extracting specific types of information (objects, faces, etc).
     """
 
+    # Class names of plugins whose per-frame output this plugin reads; it
+    # runs after them, while independent plugins may run concurrently
+    depends_on: Tuple[str, ...] = ()
+
     def __init__(self, config: Dict[str, str]):
         """
         Initialize plugin with configuration.
@@ -32,6 +36,14 @@ class AnalyzerPlugin(ABC):
         """
         pass
 
+    def reset(self) -> None:
+        """
+        Clear per-video state so the plugin can analyze another video.
+        Models loaded in setup() are kept; plugins that accumulate
+        results across frames override this.
+        """
+        pass
+
     @abstractmethod
     def analyze_frame(
         self, 
@@ -52,6 +64,31 @@ class AnalyzerPlugin(ABC):
         """
         pass
 
+    def analyze_batch(
+        self,
+        frames: List[np.ndarray],
+        frame_analyses: List[FrameAnalysis],
+        video_path: str
+    ) -> List[FrameAnalysis]:
+        """
+        Analyze several frames in one call.
+
+        Plugins backed by a batched model override this to run a single
+        inference over the micro-batch; the default analyzes frame by frame.
+        
+        Args:
+            frames: Video frames as NumPy arrays (BGR format)
+            frame_analyses: Existing analysis data for each frame
+            video_path: Path to the video being analyzed
+            
+        Returns:
+            Updated frame_analysis dictionaries, one per frame
+        """
+        return [
+            self.analyze_frame(frame, frame_analysis, video_path)
+            for frame, frame_analysis in zip(frames, frame_analyses)
+        ]
+
     @abstractmethod
     def get_results(self) -> PluginResult:
         """
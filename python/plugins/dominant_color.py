@@ -121,6 +121,10 @@ class DominantColorPlugin(AnalyzerPlugin):
     def setup(self) -> None:
         print(f"  ✓ Color Analysis: K-Means with {self.num_colors} colors, {self.color_resize}x{self.color_resize} resolution", flush=True)
 
+    def reset(self) -> None:
+        """Forget the per-frame colors of the previous video."""
+        self.frame_colors = []
+
     def analyze_frame(self, frame: np.ndarray, frame_analysis: FrameAnalysis, video_path: str) -> FrameAnalysis:
         """Extract dominant colors and color properties from a frame."""
         try:
@@ -16,6 +16,8 @@ except ImportError:
 class EmotionDetectionPlugin(AnalyzerPlugin):
     """A plugin for detecting emotions in faces."""
 
+    depends_on = ("FaceRecognitionPlugin",)
+
     def __init__(self, config: Dict[str, Union[str, bool, int, float]]):
         super().__init__(config)
         self.emotion_detector: Optional[FER] = None
@@ -20,6 +20,8 @@ class SceneContext:
 class EnvironmentPlugin(AnalyzerPlugin):
     """Zero-shot environment classifier using AI-generated captions (BLIP)."""
 
+    depends_on = ("ObjectDetectionPlugin",)
+
     OBJECT_CONFIDENCE_THRESHOLD = 0.4
 
     def __init__(self, config: Dict[str, Union[str, bool, int, float]]):
@@ -39,6 +41,12 @@ class EnvironmentPlugin(AnalyzerPlugin):
             "Salesforce/blip-image-captioning-base"
         )
 
+    def reset(self) -> None:
+        """Forget the captions and scene context of the previous video."""
+        self.captions = []
+        self.detected_objects = []
+        self.scene_context = None
+
     def analyze_frame(self, frame: np.ndarray, frame_analysis: FrameAnalysis, video_path: str) -> FrameAnalysis:
         """Caption each frame to understand its environment."""
         if self.processor is None or self.model is None:
@@ -3,6 +3,7 @@ import os
 import json
 import hashlib
 import logging
+import time
 from pathlib import Path
 from typing import Dict, List, Optional, Union
 from datetime import datetime
@@ -45,8 +46,7 @@ class FaceRecognitionPlugin(AnalyzerPlugin):
         logger.info(f"Loading known faces from: {self.known_faces_file}")
         
         if not os.path.exists(self.known_faces_file):
-            with open(self.known_faces_file, 'w', encoding='utf-8') as f:
-                json.dump([], f)
+            Path(self.known_faces_file).touch()
         else:
             self._log_file_metadata()
         
@@ -66,10 +66,20 @@ class FaceRecognitionPlugin(AnalyzerPlugin):
         
         logger.info("=" * 70 + "\n")
 
+    def reset(self) -> None:
+        """
+        Forget the faces seen in the previous video and reload the known faces,
+        which may have gained entries since setup.
+        """
+        self.all_faces = []
+        self.face_recognizer = FaceRecognizer(
+            known_faces_file=self.known_faces_file,
+            model=self.detection_model
+        )
+
     def _log_file_metadata(self) -> None:
         """Log known faces file metadata."""
         file_stat = os.stat(self.known_faces_file)
-        import time
         modified_str = time.strftime(
             '%Y-%m-%d %H:%M:%S', 
             time.localtime(file_stat.st_mtime)
@@ -77,13 +87,6 @@ class FaceRecognitionPlugin(AnalyzerPlugin):
         
         logger.info(f"File size: {file_stat.st_size} bytes")
         logger.info(f"Last modified: {modified_str}")
-        
-        try:
-            with open(self.known_faces_file, 'r') as f:
-                known_faces_data = json.load(f)
-                logger.info(f"JSON structure: {len(known_faces_data)} entries")
-        except Exception as e:
-            logger.error(f"Error reading known faces file: {e}")
 
     def _log_loaded_faces(self) -> None:
         """Log detailed information about loaded known faces."""
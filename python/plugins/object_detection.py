@@ -1,3 +1,4 @@
+from pathlib import Path
 from typing import List, Dict, Optional, Union, Literal
 import numpy as np
 import torch
@@ -8,6 +9,53 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+try:
+    import onnxruntime  # noqa: F401  (ultralytics runs .onnx models through it)
+    ONNXRUNTIME_AVAILABLE = True
+except ImportError:
+    ONNXRUNTIME_AVAILABLE = False
+
+
+def export_onnx_if_missing(model_path: str) -> str:
+    """
+    Export a YOLO .pt model to ONNX next to it, once, and return the .onnx path.
+
+    The export is reused while it is newer than the weights. It has a dynamic
+    batch and input size so batched predictions at any imgsz can use it.
+    """
+    onnx_path = Path(model_path).with_suffix('.onnx')
+    if onnx_path.exists() and (
+        not Path(model_path).exists() or onnx_path.stat().st_mtime >= Path(model_path).stat().st_mtime
+    ):
+        return str(onnx_path)
+
+    logger.info(f"Exporting {model_path} to ONNX for CPU inference...")
+    return str(YOLO(model_path).export(format='onnx', dynamic=True, simplify=True))
+
+
+def quantize_onnx_if_missing(onnx_path: str) -> str:
+    """
+    Dynamically quantize an ONNX export to INT8 weights, once, and return its path.
+
+    The export's metadata (class names, task, input size) is copied over so
+    ultralytics loads the quantized model like the original.
+    """
+    import onnx
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    int8_path = Path(onnx_path).with_suffix('.int8.onnx')
+    if int8_path.exists() and int8_path.stat().st_mtime >= Path(onnx_path).stat().st_mtime:
+        return str(int8_path)
+
+    logger.info(f"Quantizing {onnx_path} to INT8...")
+    quantize_dynamic(onnx_path, str(int8_path), weight_type=QuantType.QInt8)
+
+    quantized = onnx.load(str(int8_path))
+    del quantized.metadata_props[:]
+    quantized.metadata_props.extend(onnx.load(onnx_path).metadata_props)
+    onnx.save(quantized, str(int8_path))
+    return str(int8_path)
+
 
 class ObjectDetectionPlugin(AnalyzerPlugin):
     """A plugin for detecting objects in video frames using YOLO."""
@@ -29,57 +77,84 @@ class ObjectDetectionPlugin(AnalyzerPlugin):
     def setup(self) -> None:
         """Initialize the YOLO model."""
         model_path = str(self.config.get('yolo_model', 'yolov8n.pt'))
-        self.yolo_model = YOLO(model_path)
         
         requested_device = str(self.config['device'])
         if "cuda" in requested_device.lower() and not torch.cuda.is_available():
             logger.warning(f"Requested device '{requested_device}' not available. Falling back to CPU.")
             self.config['device'] = 'cpu'
-        
+
+        # On CPU, ONNX Runtime's fused graph and MLAS kernels beat PyTorch eager
+        if self.config['device'] == 'cpu' and self.config.get('yolo_onnx', True) and ONNXRUNTIME_AVAILABLE:
+            try:
+                onnx_path = export_onnx_if_missing(model_path)
+                if self.config.get('quantization') == 'int8':
+                    try:
+                        onnx_path = quantize_onnx_if_missing(onnx_path)
+                    except Exception as e:
+                        logger.warning(f"INT8 quantization failed, using the FP32 ONNX model: {e}")
+                self.yolo_model = YOLO(onnx_path, task='detect')
+                logger.info(f"Running object detection with ONNX Runtime ({Path(onnx_path).name})")
+                return
+            except Exception as e:
+                logger.warning(f"ONNX model unavailable, using the PyTorch model: {e}")
+
+        self.yolo_model = YOLO(model_path)
         self.yolo_model.to(self.config['device'])
         self.yolo_model.fuse()
 
     def analyze_frame(self, frame: np.ndarray, frame_analysis: FrameAnalysis, video_path: str) -> FrameAnalysis:
-        detections_results = self._run_object_detection([frame])
-        
-        scale_factor = float(frame_analysis.get('scale_factor', 1.0))
-        
+        return self.analyze_batch([frame], [frame_analysis], video_path)[0]
+
+    def analyze_batch(
+        self, frames: List[np.ndarray], frame_analyses: List[FrameAnalysis], video_path: str
+    ) -> List[FrameAnalysis]:
+        """Detect objects in all frames with a single batched YOLO call."""
+        detections_results = self._run_object_detection(frames)
+
+        for i, frame_analysis in enumerate(frame_analyses):
+            detections = detections_results[i] if i < len(detections_results) else None
+            frame_analysis['objects'] = self._frame_objects(
+                detections, float(frame_analysis.get('scale_factor', 1.0))
+            )
+        return frame_analyses
+
+    def _frame_objects(self, detections, scale_factor: float) -> List[Dict[str, Union[str, float, Dict[str, float]]]]:
+        """Convert one frame's YOLO detections to objects in original-resolution coordinates."""
         frame_objects: List[Dict[str, Union[str, float, Dict[str, float]]]] = []
-        if detections_results and self.yolo_model is not None:
-            detections = detections_results[0]
-            if detections.boxes:
-                for det in detections.boxes:
-                    label = self.yolo_model.names[int(det.cls[0])]
-                    confidence = float(det.conf[0])
-                    
-                    x1, y1, x2, y2 = det.xyxy[0].tolist()
-                    
-                    x1_orig = x1 * scale_factor
-                    y1_orig = y1 * scale_factor
-                    x2_orig = x2 * scale_factor
-                    y2_orig = y2 * scale_factor
-                    
-                    x = x1_orig
-                    y = y1_orig
-                    width = x2_orig - x1_orig
-                    height = y2_orig - y1_orig
-                    
-                    if width < 20 or height < 20:
-                        continue
-
-                    frame_objects.append({
-                        "label": label,
-                        "confidence": confidence,
-                        "bbox": {
-                            "x": x,
-                            "y": y,
-                            "width": width,
-                            "height": height
-                        }
-                    })
-                    
-        frame_analysis['objects'] = frame_objects
-        return frame_analysis
+        if detections is None or self.yolo_model is None or not detections.boxes:
+            return frame_objects
+
+        for det in detections.boxes:
+            label = self.yolo_model.names[int(det.cls[0])]
+            confidence = float(det.conf[0])
+            
+            x1, y1, x2, y2 = det.xyxy[0].tolist()
+            
+            x1_orig = x1 * scale_factor
+            y1_orig = y1 * scale_factor
+            x2_orig = x2 * scale_factor
+            y2_orig = y2 * scale_factor
+            
+            x = x1_orig
+            y = y1_orig
+            width = x2_orig - x1_orig
+            height = y2_orig - y1_orig
+            
+            if width < 20 or height < 20:
+                continue
+
+            frame_objects.append({
+                "label": label,
+                "confidence": confidence,
+                "bbox": {
+                    "x": x,
+                    "y": y,
+                    "width": width,
+                    "height": height
+                }
+            })
+
+        return frame_objects
 
     def _run_object_detection(self, frames: List[np.ndarray]) -> List:
         """Run YOLO object detection on a batch of frames."""
@@ -88,7 +163,6 @@ class ObjectDetectionPlugin(AnalyzerPlugin):
             
         device = str(self.config['device'])
         is_mps = self.config['device'] == 'mps'
-        batch_size = 4 if is_mps else 1
         imgsz = 640 if is_mps else 320
         
         confidence = float(self.config.get('yolo_confidence', 0.5))
@@ -104,7 +178,7 @@ class ObjectDetectionPlugin(AnalyzerPlugin):
                 half=self.use_half,
                 augment=False,
                 imgsz=imgsz,
-                batch=batch_size,
+                batch=len(frames),
             )
 
     def get_results(self) -> PluginResult:
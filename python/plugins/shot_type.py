@@ -9,6 +9,8 @@ class ShotTypePlugin(AnalyzerPlugin):
     Depends on face detection data from FaceRecognitionPlugin.
     """
 
+    depends_on = ("FaceRecognitionPlugin",)
+
     def __init__(self, config: Dict[str, str]):
         super().__init__(config)
         self.CLOSE_UP_THRESHOLD = config.get("close_up_threshold", 0.3)
@@ -18,6 +20,9 @@ class ShotTypePlugin(AnalyzerPlugin):
     def setup(self):
         pass
 
+    def reset(self) -> None:
+        self.ratio_window.clear()
+
     def analyze_frame(self, frame: np.ndarray, frame_analysis: FrameAnalysis, video_path: str) -> FrameAnalysis:
         frame_height, frame_width = frame.shape[:2]
         faces = frame_analysis.get("faces", [])
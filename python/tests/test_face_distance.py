@@ -0,0 +1,44 @@
+import unittest
+import sys
+import os
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from face_distance import face_distances
+from face_store import ENCODING_SIZE, load_known_faces, write_known_faces
+
+
+class TestFaceDistances(unittest.TestCase):
+    """Test face_distances against encodings as the face store hands them out"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.store_path = os.path.join(self.temp_dir.name, 'known_faces.json')
+        rng = np.random.default_rng(0)
+        self.encodings = rng.random((3, ENCODING_SIZE)).astype(np.float32)
+        self.query = rng.random(ENCODING_SIZE)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_distances_on_encodings_loaded_from_disk(self):
+        """The loaded matrix is a read-only memmap and must still be accepted"""
+        write_known_faces(self.store_path, ['alice', 'bob', 'carol'], self.encodings)
+        _, known = load_known_faces(self.store_path)
+
+        distances = face_distances(known, self.query)
+
+        expected = np.linalg.norm(self.encodings - self.query.astype(np.float32), axis=1)
+        np.testing.assert_allclose(distances, expected, rtol=1e-5)
+
+    def test_empty_matrix(self):
+        """No known faces gives no distances"""
+        distances = face_distances(np.empty((0, ENCODING_SIZE), dtype=np.float32), self.query)
+        self.assertEqual(distances.shape, (0,))
+
+
+if __name__ == '__main__':
+    unittest.main()
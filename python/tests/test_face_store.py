@@ -0,0 +1,92 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from face_store import (
+    ENCODING_SIZE,
+    ROW_BYTES,
+    append_known_faces,
+    encodings_path,
+    is_legacy_file,
+    load_known_faces,
+    migrate_legacy_file,
+    write_known_faces,
+)
+
+
+class TestFaceStore(unittest.TestCase):
+    """Test the JSONL names file + float32 sidecar known faces store"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.store_path = os.path.join(self.temp_dir.name, 'known_faces.json')
+        self.rng = np.random.default_rng(0)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _encodings(self, count):
+        return self.rng.random((count, ENCODING_SIZE)).astype(np.float32)
+
+    def test_write_load_round_trip(self):
+        """Names and encodings come back unchanged and in order"""
+        names = ['alice', 'bob', 'alice']
+        encodings = self._encodings(3)
+
+        write_known_faces(self.store_path, names, encodings)
+        loaded_names, loaded = load_known_faces(self.store_path)
+
+        self.assertEqual(loaded_names, names)
+        self.assertEqual(loaded.dtype, np.float32)
+        np.testing.assert_array_equal(loaded, encodings)
+        self.assertFalse(is_legacy_file(self.store_path))
+
+    def test_append_after_truncated_row(self):
+        """A partially written trailing row is dropped before appending"""
+        encodings = self._encodings(2)
+        write_known_faces(self.store_path, ['alice', 'bob'], encodings)
+
+        # Simulate an append interrupted halfway through a row
+        with open(encodings_path(self.store_path), 'ab') as f:
+            f.write(b'\x00' * (ROW_BYTES // 2))
+
+        new_encoding = self._encodings(1)
+        append_known_faces(self.store_path, ['carol'], new_encoding)
+
+        self.assertEqual(os.path.getsize(encodings_path(self.store_path)), 3 * ROW_BYTES)
+        loaded_names, loaded = load_known_faces(self.store_path)
+        self.assertEqual(loaded_names, ['alice', 'bob', 'carol'])
+        np.testing.assert_array_equal(loaded, np.vstack([encodings, new_encoding]))
+
+    def test_migrate_legacy_file(self):
+        """A baseline known_faces.json list is converted and keeps its faces"""
+        encodings = self._encodings(2)
+        legacy = [
+            {"name": "alice", "encoding": encodings[0].tolist()},
+            {"name": "bob", "encoding": encodings[1].tolist()},
+        ]
+        with open(self.store_path, 'w') as f:
+            json.dump(legacy, f, indent=2)
+
+        self.assertTrue(is_legacy_file(self.store_path))
+        self.assertTrue(migrate_legacy_file(self.store_path))
+        self.assertFalse(is_legacy_file(self.store_path))
+        self.assertFalse(migrate_legacy_file(self.store_path))
+
+        loaded_names, loaded = load_known_faces(self.store_path)
+        self.assertEqual(loaded_names, ['alice', 'bob'])
+        np.testing.assert_array_equal(loaded, encodings)
+
+        # The migrated store accepts appends like a new one
+        append_known_faces(self.store_path, ['carol'], self._encodings(1))
+        self.assertEqual(load_known_faces(self.store_path)[0], ['alice', 'bob', 'carol'])
+
+
+if __name__ == '__main__':
+    unittest.main()
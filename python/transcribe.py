@@ -1,13 +1,10 @@
-import sys
-import io
 import json
 import logging
-import re
 import time
 import threading
 import os
 from pathlib import Path
-from typing import Optional, Callable, Dict, List, TextIO, Literal
+from typing import Optional, Callable, Dict, List, Literal
 from dataclasses import dataclass
 import torch
 from faster_whisper import WhisperModel
@@ -80,80 +77,6 @@ class ModelDownloadProgress:
             self.callback(progress, f"Downloading model: {self.downloaded / (1024**3):.2f}GB / {self.total_size / (1024**3):.2f}GB")
 
 
-class StderrInterceptor(io.TextIOBase):
-    def __init__(self, original_stderr: TextIO, line_callback: Optional[Callable[[str], None]] = None):
-        self.original_stderr = original_stderr
-        self.line_callback = line_callback
-        self._buffer = ""
-        outer_self = self
-
-        class BufferProxy(io.RawIOBase):
-            def write(_, b: bytes) -> int:
-                text = b.decode("utf-8", errors="ignore")
-                outer_self._handle_text(text)
-                return outer_self.original_stderr.buffer.write(b)
-
-        self.buffer = BufferProxy()
-
-    def _handle_text(self, data: str) -> None:
-        self._buffer += data
-        parts = self._buffer.split('\r')
-        if len(parts) > 1:
-            for part in parts[:-1]:
-                if part.strip() and self.line_callback:
-                    self.line_callback(part.strip())
-            self._buffer = parts[-1]
-
-        lines = self._buffer.split('\n')
-        if len(lines) > 1:
-            for line in lines[:-1]:
-                if line.strip() and self.line_callback:
-                    self.line_callback(line.strip())
-            self._buffer = lines[-1]
-
-    def write(self, data: str) -> int:
-        self._handle_text(data)
-        return self.original_stderr.write(data)
-
-    def flush(self) -> None:
-        if self._buffer.strip() and self.line_callback:
-            self.line_callback(self._buffer.strip())
-        self._buffer = ""
-        self.original_stderr.flush()
-
-
-class ProgressTracker:
-    PROGRESS_PATTERN = re.compile(r"(\d+)%")
-    ELAPSED_PATTERN = re.compile(r"\[(\d+):(\d+)<(\d+):(\d+),")
-
-    def __init__(self, callback: Optional[Callable[[int, str], None]] = None):
-        self.callback = callback
-        self.last_progress: int = -1
-
-    def parse_line(self, line: str) -> None:
-        match = self.PROGRESS_PATTERN.search(line)
-        if not match:
-            return
-
-        progress = int(match.group(1))
-        if progress == self.last_progress:
-            return
-
-        self.last_progress = progress
-        elapsed_time = self._extract_elapsed_time(line)
-
-        if self.callback:
-            self.callback(progress, elapsed_time)
-
-    def _extract_elapsed_time(self, line: str) -> str:
-        match = self.ELAPSED_PATTERN.search(line)
-        if match:
-            minutes = int(match.group(1))
-            seconds = int(match.group(2))
-            return f"{minutes:02d}:{seconds:02d}"
-        return "00:00"
-
-
 class TranscriptionService:
     def __init__(
         self,
@@ -171,6 +94,8 @@ class TranscriptionService:
         self._model: Optional[WhisperModel] = None
         self._model_loading: bool = False
         self._model_loaded: bool = False
+        # Held for the first load so concurrent transcriptions wait for one model
+        self._model_lock: threading.Lock = threading.Lock()
         self._download_thread: Optional[threading.Thread] = None
 
     def _get_model_path(self) -> str:
@@ -246,33 +171,39 @@ class TranscriptionService:
 
     @property
     def model(self) -> WhisperModel:
-        if self._model is None:
-            if self._model_loading:
-                raise RuntimeError("Model is currently being loaded")
+        if self._model is not None:
+            return self._model
 
-            self._model_loading = True
+        with self._model_lock:
+            if self._model is None:
+                self._model_loading = True
+                try:
+                    self._load_model()
+                finally:
+                    self._model_loading = False
 
-            if not self.is_model_cached():
-                logger.info("Model not cached, downloading...")
-                self._download_model_sync()
+        return self._model
 
-            logging.getLogger("httpx").setLevel(logging.INFO)
-            logging.getLogger("huggingface_hub").setLevel(logging.INFO)
+    def _load_model(self) -> None:
+        """Download the model if needed and load it; called with _model_lock held."""
+        if not self.is_model_cached():
+            logger.info("Model not cached, downloading...")
+            self._download_model_sync()
 
-            logger.info(f"Loading Faster-Whisper model: {self.model_name}")
+        logging.getLogger("httpx").setLevel(logging.INFO)
+        logging.getLogger("huggingface_hub").setLevel(logging.INFO)
 
-            self._model = WhisperModel(
-                self.model_name,
-                device=self.device,
-                compute_type=self.compute_type,
-                download_root=self.cache_dir
-            )
+        logger.info(f"Loading Faster-Whisper model: {self.model_name}")
 
-            logger.info("Model loaded successfully")
-            self._model_loading = False
-            self._model_loaded = True
+        self._model = WhisperModel(
+            self.model_name,
+            device=self.device,
+            compute_type=self.compute_type,
+            download_root=self.cache_dir
+        )
 
-        return self._model
+        logger.info("Model loaded successfully")
+        self._model_loaded = True
 
     def wait_for_download(self, timeout: Optional[float] = None) -> bool:
         """Wait for background download to complete"""
@@ -285,7 +216,7 @@ class TranscriptionService:
         self,
         video_path: str,
         output_path: str,
-        progress_callback: Optional[Callable[[int, str], None]] = None
+        progress_callback: Optional[Callable[[int, int], None]] = None
     ) -> TranscriptionResult:
         video_file = Path(video_path)
         if not video_file.exists():
@@ -295,23 +226,21 @@ class TranscriptionService:
         start_transcription_time = time.time()
 
         if progress_callback:
-            progress_callback(1, "00:00")
-
-        progress_tracker = ProgressTracker(progress_callback)
-        original_stderr = sys.stderr
-        sys.stderr = StderrInterceptor(original_stderr, progress_tracker.parse_line)
+            progress_callback(1, 0)
 
         result_segments: List[Segment] = []
         full_text = ""
         total_duration = 0.0
+        last_progress = -1
 
         try:
+            # Progress comes straight from the segment generator, which decodes
+            # lazily, rather than from scraping the tqdm bar off stderr
             segments, info = self.model.transcribe(
                 str(video_path),
                 beam_size=1,
                 word_timestamps=True,
                 vad_filter=True,
-                log_progress=True,
                 vad_parameters={
                     "threshold": 0.5,
                     "min_speech_duration_ms": 250,
@@ -320,10 +249,8 @@ class TranscriptionService:
             )
 
             total_duration = round(info.duration, 2) if info else 0.0
-            processed_duration = 0.0
-            segments_list = list(segments)
 
-            for seg in segments_list:
+            for seg in segments:
                 segment_data = Segment(
                     id=seg.id,
                     start=seg.start,
@@ -343,13 +270,12 @@ class TranscriptionService:
 
                 result_segments.append(segment_data)
                 full_text += seg.text + " "
-                processed_duration += seg.end - seg.start
 
-                percent_done = (processed_duration / total_duration) * 100 if total_duration > 0 else 100
-                elapsed_str = f"{int(processed_duration // 60):02d}:{int(processed_duration % 60):02d}"
-
-                if progress_callback:
-                    progress_callback(int(percent_done), elapsed_str)
+                # 100 is reported once the whole result is ready
+                progress = min(int(seg.end / total_duration * 100), 99) if total_duration > 0 else 99
+                if progress_callback and progress != last_progress:
+                    last_progress = progress
+                    progress_callback(progress, int(time.time() - start_transcription_time))
 
             result = TranscriptionResult(
                 text=full_text.strip(),
@@ -364,16 +290,12 @@ class TranscriptionService:
                 result = TranscriptionResult(text='', segments=[], language='N/A')
                 self._save_result(result.to_dict(), output_path)
                 if progress_callback:
-                    progress_callback(100, "00:00")
+                    progress_callback(100, 0)
                 return result
             raise
 
-        finally:
-            sys.stderr = original_stderr
-
-        total_transcription_time = int(time.time() - start_transcription_time)
         if progress_callback:
-            progress_callback(100, f"{total_transcription_time // 60:02d}:{total_transcription_time % 60:02d}")
+            progress_callback(100, int(time.time() - start_transcription_time))
 
         self._save_result(result.to_dict(), output_path)
         return result
@@ -397,7 +319,7 @@ class TranscriptionService:
 def run_transcription(
     video_path: str,
     json_file_path: str,
-    progress_callback: Optional[Callable[[int, str], None]] = None
+    progress_callback: Optional[Callable[[int, int], None]] = None
 ) -> Dict[str, object]:
     service = TranscriptionService()
     result = service.transcribe(video_path, json_file_path, progress_callback)